@@ -1,4 +1,5 @@
-use std::path::PathBuf;
+use std::path::{Path, PathBuf};
+use std::sync::OnceLock;
 
 use serde::{Deserialize, Serialize};
 
@@ -104,7 +105,7 @@ impl Settings {
     /// Expand `~` to the user's home directory.
     fn expand_home(path: &str) -> PathBuf {
         if path.starts_with('~') {
-            if let Some(home) = dirs::home_dir() {
+            if let Some(home) = home_dir() {
                 return home.join(&path[2..]);
             }
         }
@@ -148,15 +149,16 @@ impl Settings {
             None => Self::config_path(),
         };
 
-        if path.exists() {
-            let content = std::fs::read_to_string(&path)
-                .map_err(|e| NomadError::Config(format!("Failed to read config: {e}")))?;
-            let settings: Settings = toml::from_str(&content)
-                .map_err(|e| NomadError::Config(format!("Failed to parse config: {e}")))?;
-            Ok(settings)
-        } else {
-            Ok(Settings::default())
-        }
+        // Read directly and treat NotFound as "no config" instead of probing
+        // with exists() first: one syscall less and no TOCTOU window.
+        let content = match std::fs::read_to_string(&path) {
+            Ok(content) => content,
+            Err(e) if e.kind() == std::io::ErrorKind::NotFound => return Ok(Settings::default()),
+            Err(e) => return Err(NomadError::Config(format!("Failed to read config: {e}"))),
+        };
+        let settings: Settings = toml::from_str(&content)
+            .map_err(|e| NomadError::Config(format!("Failed to parse config: {e}")))?;
+        Ok(settings)
     }
 
     /// Save the current settings to the TOML config file.
@@ -182,6 +184,14 @@ impl Settings {
     }
 }
 
+/// The user's home directory, resolved once per process.
+/// Every `base_dir()`/`repos_dir()`/`worktrees_dir()` call expands `~`, and
+/// `dirs::home_dir()` re-reads `$HOME` (or the passwd entry) each time.
+fn home_dir() -> Option<&'static Path> {
+    static HOME: OnceLock<Option<PathBuf>> = OnceLock::new();
+    HOME.get_or_init(dirs::home_dir).as_deref()
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
@@ -270,6 +280,14 @@ secret = "s3cret"
         assert_eq!(loaded.api.port, 8080); // default preserved
     }
 
+    #[test]
+    fn test_load_missing_file_returns_defaults() {
+        let tmp = TempDir::new().unwrap();
+        let loaded = Settings::load(Some(&tmp.path().join("missing.toml"))).unwrap();
+        assert_eq!(loaded.paths.base_dir, "~/.nomadflowcode");
+        assert_eq!(loaded.api.port, 8080);
+    }
+
     #[test]
     fn test_ensure_directories() {
         let tmp = TempDir::new().unwrap();
@@ -74,6 +74,13 @@ pub struct HealthResponse {
     pub api_port: u16,
 }
 
+/// Error body returned by API routes (`{"detail": "..."}`).
+#[derive(Debug, Clone, Serialize, Deserialize)]
+#[serde(rename_all = "camelCase")]
+pub struct ErrorResponse {
+    pub detail: String,
+}
+
 // ---- Branch models ----
 
 #[derive(Debug, Clone, Serialize, Deserialize)]
@@ -203,6 +210,14 @@ mod tests {
         assert!(json.contains("\"tmuxWindow\""));
     }
 
+    #[test]
+    fn test_error_response_serialization() {
+        let resp = ErrorResponse {
+            detail: "boom".to_string(),
+        };
+        assert_eq!(serde_json::to_string(&resp).unwrap(), r#"{"detail":"boom"}"#);
+    }
+
     #[test]
     fn test_list_features_request_deserialization() {
         let json = r#"{"repoPath": "/tmp/repo"}"#;
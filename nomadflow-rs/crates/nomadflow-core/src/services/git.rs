@@ -1,13 +1,30 @@
+use std::collections::{HashMap, HashSet};
 use std::path::{Path, PathBuf};
+use std::process::Stdio;
+use std::sync::{Arc, Mutex};
+use std::time::SystemTime;
+
+use tokio::io::{AsyncBufReadExt, BufReader};
+use tokio::process::Command;
+use tokio::sync::{mpsc, Semaphore};
+use tokio::task::JoinSet;
 
 use crate::config::Settings;
 use crate::error::{NomadError, Result};
 use crate::models::{BranchInfo, Feature, Repository};
-use crate::shell::{run, run_command};
+use crate::shell::{exec, exec_command_capped, exec_status, quote, run_command, run_status};
+
+/// Upper bound on concurrent branch lookups in `list_repos`.
+const MAX_CONCURRENT_LOOKUPS: usize = 16;
+
+/// Modification times of the files a repo's feature list is derived from.
+type FeaturesFingerprint = Vec<Option<SystemTime>>;
 
 pub struct GitService {
     repos_dir: PathBuf,
     worktrees_dir: PathBuf,
+    /// Last `list_features` result per repo path, valid while its fingerprint matches.
+    features_cache: Mutex<HashMap<String, (FeaturesFingerprint, Vec<Feature>)>>,
 }
 
 impl GitService {
@@ -15,6 +32,7 @@ impl GitService {
         Self {
             repos_dir: settings.repos_dir(),
             worktrees_dir: settings.worktrees_dir(),
+            features_cache: Mutex::new(HashMap::new()),
         }
     }
 
@@ -26,19 +44,41 @@ impl GitService {
             return Ok(repos);
         }
 
+        let mut candidates = Vec::new();
         let mut entries = tokio::fs::read_dir(&self.repos_dir).await?;
         while let Some(entry) = entries.next_entry().await? {
             let path = entry.path();
             if path.is_dir() && path.join(".git").exists() {
-                let branch = self.get_current_branch(&path).await;
-                repos.push(Repository {
-                    name: path.file_name().unwrap_or_default().to_string_lossy().to_string(),
-                    path: path.to_string_lossy().to_string(),
-                    branch,
-                });
+                candidates.push(path);
             }
         }
 
+        // Resolve branches concurrently; the semaphore bounds how many git
+        // processes (detached HEAD fallback) can be in flight at once.
+        let limit = Arc::new(Semaphore::new(MAX_CONCURRENT_LOOKUPS));
+        let mut tasks = JoinSet::new();
+        for (index, path) in candidates.iter().cloned().enumerate() {
+            let limit = Arc::clone(&limit);
+            tasks.spawn(async move {
+                let _permit = limit.acquire_owned().await;
+                (index, current_branch(&path).await)
+            });
+        }
+
+        let mut branches = vec![String::new(); candidates.len()];
+        while let Some(joined) = tasks.join_next().await {
+            let (index, branch) = joined.map_err(|e| NomadError::Other(e.to_string()))?;
+            branches[index] = branch;
+        }
+
+        for (path, branch) in candidates.into_iter().zip(branches) {
+            repos.push(Repository {
+                name: path.file_name().unwrap_or_default().to_string_lossy().to_string(),
+                path: path.to_string_lossy().to_string(),
+                branch,
+            });
+        }
+
         Ok(repos)
     }
 
@@ -50,25 +90,15 @@ impl GitService {
         name: Option<&str>,
     ) -> Result<(String, String, String)> {
         // Extract repo name from URL if not provided
-        let repo_name = match name {
-            Some(n) if !n.is_empty() => n.to_string(),
-            _ => {
-                let path_part = url.trim_end_matches('/');
-                let stem = Path::new(path_part)
-                    .file_stem()
-                    .map(|s| s.to_string_lossy().to_string())
-                    .unwrap_or_default();
-                if stem.is_empty() {
-                    return Err(NomadError::Other(
-                        "Cannot determine repository name from URL".to_string(),
-                    ));
-                }
-                stem
-            }
+        let raw_name = match name {
+            Some(n) if !n.is_empty() => n,
+            _ => repo_name_from_url(url).ok_or_else(|| {
+                NomadError::Other("Cannot determine repository name from URL".to_string())
+            })?,
         };
 
         // Sanitize name
-        let repo_name = sanitize_name(&repo_name);
+        let repo_name = sanitize_name(raw_name);
 
         let dest = self.repos_dir.join(&repo_name);
         if dest.exists() {
@@ -87,11 +117,15 @@ impl GitService {
             url.to_string()
         };
 
-        let dest_str = dest.to_string_lossy();
-        let result = run_command(
-            &format!("git clone {clone_url} {dest_str}"),
+        // Only the end of stderr matters for the error message (the fatal:
+        // line); a long clone's progress output is drained rather than buffered.
+        let dest_str = dest.to_string_lossy().into_owned();
+        let result = exec_command_capped(
+            "git",
+            &["clone", "--", &clone_url, &dest_str],
             None,
             600.0,
+            4096,
         )
         .await;
 
@@ -104,20 +138,24 @@ impl GitService {
 
         // Security: remove token from remote URL
         if token.is_some() {
-            run(
-                &format!("git remote set-url origin {url}"),
+            exec_status(
+                "git",
+                &["remote", "set-url", "origin", url],
                 Some(&dest_str),
             )
             .await;
         }
 
         let branch = self.get_current_branch(&dest).await;
-        Ok((repo_name, dest.to_string_lossy().to_string(), branch))
+        Ok((repo_name, dest_str, branch))
     }
 
     /// List all worktrees (features) for a repository.
+    ///
+    /// Results are cached per repo and reused while the worktree metadata they
+    /// were built from is unchanged, so repeated refreshes cost a few `stat`s
+    /// instead of a `git worktree list`.
     pub async fn list_features(&self, repo_path: &str) -> Result<Vec<Feature>> {
-        let mut features = Vec::new();
         let repo_path_obj = PathBuf::from(repo_path);
         let repo_name = repo_path_obj
             .file_name()
@@ -125,137 +163,277 @@ impl GitService {
             .to_string_lossy()
             .to_string();
 
+        let fingerprint = self.features_fingerprint(&repo_path_obj, &repo_name).await;
+        if let Some(fingerprint) = &fingerprint {
+            let cache = self.features_cache.lock().unwrap();
+            if let Some((cached_fingerprint, features)) = cache.get(repo_path) {
+                if cached_fingerprint == fingerprint {
+                    return Ok(features.clone());
+                }
+            }
+        }
+
+        let features = self.scan_features(repo_path, &repo_name).await?;
+        if let Some(fingerprint) = fingerprint {
+            self.features_cache
+                .lock()
+                .unwrap()
+                .insert(repo_path.to_string(), (fingerprint, features.clone()));
+        }
+        Ok(features)
+    }
+
+    /// Same features as `list_features`, sent to `tx` one at a time: each
+    /// registered worktree as soon as `git worktree list --porcelain` has
+    /// written its block, then the unregistered directories. A still valid
+    /// cached list is sent as is. Stops (killing git) once `tx` is closed.
+    pub async fn stream_features(&self, repo_path: &str, tx: mpsc::Sender<Feature>) -> Result<()> {
+        let repo_path_obj = PathBuf::from(repo_path);
+        let repo_name = repo_path_obj
+            .file_name()
+            .unwrap_or_default()
+            .to_string_lossy()
+            .to_string();
+
+        let fingerprint = self.features_fingerprint(&repo_path_obj, &repo_name).await;
+        if let Some(fingerprint) = &fingerprint {
+            let cached = self
+                .features_cache
+                .lock()
+                .unwrap()
+                .get(repo_path)
+                .filter(|(cached_fingerprint, _)| cached_fingerprint == fingerprint)
+                .map(|(_, features)| features.clone());
+            if let Some(features) = cached {
+                for feature in features {
+                    if tx.send(feature).await.is_err() {
+                        break;
+                    }
+                }
+                return Ok(());
+            }
+        }
+
+        let canonical_repo = std::fs::canonicalize(repo_path)
+            .unwrap_or_else(|_| PathBuf::from(repo_path));
+
+        let mut child = Command::new("git")
+            .args(["worktree", "list", "--porcelain"])
+            .current_dir(repo_path)
+            .stdout(Stdio::piped())
+            .stderr(Stdio::null())
+            .kill_on_drop(true)
+            .spawn()?;
+        let Some(stdout) = child.stdout.take() else {
+            return Ok(());
+        };
+        let mut lines = BufReader::new(stdout).lines();
+
+        let mut features = Vec::new();
+        let mut block = String::new();
+        loop {
+            let line = lines.next_line().await?;
+            if let Some(line) = line.as_deref().filter(|line| !line.is_empty()) {
+                block.push_str(line);
+                block.push('\n');
+                continue;
+            }
+
+            // A blank line (or the end of the output) closes a block
+            if let Some(wt) = parse_worktree_porcelain(&block).next() {
+                let feature =
+                    worktree_feature(wt.path.to_string(), wt.branch, &canonical_repo, &repo_name);
+                if tx.send(feature.clone()).await.is_err() {
+                    return Ok(());
+                }
+                features.push(feature);
+            }
+            block.clear();
+
+            if line.is_none() {
+                break;
+            }
+        }
+
+        // Like scan_features: nothing more to list when git failed
+        if !child.wait().await?.success() {
+            return Ok(());
+        }
+
+        for feature in self.unregistered_features(&repo_name, &features).await? {
+            if tx.send(feature.clone()).await.is_err() {
+                return Ok(());
+            }
+            features.push(feature);
+        }
+
+        if let Some(fingerprint) = fingerprint {
+            self.features_cache
+                .lock()
+                .unwrap()
+                .insert(repo_path.to_string(), (fingerprint, features));
+        }
+        Ok(())
+    }
+
+    /// Drop the cached feature list of a repo after changing its worktrees.
+    fn invalidate_features(&self, repo_path: &str) {
+        self.features_cache.lock().unwrap().remove(repo_path);
+    }
+
+    /// Modification times of everything `scan_features` reads: HEAD, git's
+    /// per-worktree metadata (whose HEADs move on checkout) and the repo's
+    /// directory under the worktrees dir. `None` when the repo has no
+    /// readable git dir, in which case nothing is cached.
+    async fn features_fingerprint(
+        &self,
+        repo_path: &Path,
+        repo_name: &str,
+    ) -> Option<FeaturesFingerprint> {
+        async fn mtime(path: &Path) -> Option<SystemTime> {
+            tokio::fs::metadata(path).await.ok()?.modified().ok()
+        }
+
+        let git_dir = resolve_git_dir(repo_path).await?;
+        let git_worktrees = resolve_common_dir(&git_dir).await.join("worktrees");
+
+        let mut fingerprint = vec![
+            mtime(&git_dir.join("HEAD")).await,
+            mtime(&git_worktrees).await,
+            mtime(&self.worktrees_dir.join(repo_name)).await,
+        ];
+
+        if let Ok(mut entries) = tokio::fs::read_dir(&git_worktrees).await {
+            let mut worktrees = Vec::new();
+            while let Ok(Some(entry)) = entries.next_entry().await {
+                worktrees.push(entry.path());
+            }
+            worktrees.sort();
+            for worktree in worktrees {
+                fingerprint.push(mtime(&worktree.join("HEAD")).await);
+            }
+        }
+
+        Some(fingerprint)
+    }
+
+    /// Build the feature list from `git worktree list` and the worktrees dir.
+    async fn scan_features(&self, repo_path: &str, repo_name: &str) -> Result<Vec<Feature>> {
+        let mut features = Vec::new();
+
         // Canonicalize repo_path for reliable comparison with worktree paths
         let canonical_repo = std::fs::canonicalize(repo_path)
             .unwrap_or_else(|_| PathBuf::from(repo_path));
 
-        let result = run("git worktree list --porcelain", Some(repo_path)).await;
+        let result = exec("git", &["worktree", "list", "--porcelain"], Some(repo_path)).await;
         if !result.success() {
             return Ok(features);
         }
 
-        // Parse worktree list output
-        let mut current_worktree: Option<String> = None;
-        let mut current_branch: Option<String> = None;
-
-        for line in result.stdout.lines() {
-            let line = line.trim();
-            if line.is_empty() {
-                if let Some(wt_path) = current_worktree.take() {
-                    let branch = current_branch.take().unwrap_or_default();
-                    let branch = branch
-                        .strip_prefix("refs/heads/")
-                        .unwrap_or(&branch)
-                        .to_string();
-
-                    let canonical_wt = std::fs::canonicalize(&wt_path)
-                        .unwrap_or_else(|_| PathBuf::from(&wt_path));
-                    let is_main = canonical_wt == canonical_repo;
-                    let name = if is_main {
-                        if branch.is_empty() {
-                            repo_name.clone()
-                        } else {
-                            branch.clone()
-                        }
-                    } else {
-                        Path::new(&wt_path)
-                            .file_name()
-                            .unwrap_or_default()
-                            .to_string_lossy()
-                            .to_string()
-                    };
-
-                    features.push(Feature {
-                        name,
-                        worktree_path: wt_path,
-                        branch,
-                        is_active: false,
-                        is_main,
-                    });
-                }
-                current_branch = None;
-            } else if let Some(rest) = line.strip_prefix("worktree ") {
-                current_worktree = Some(rest.to_string());
-            } else if let Some(rest) = line.strip_prefix("branch ") {
-                current_branch = Some(rest.to_string());
-            }
+        // The porcelain blocks already carry every registered worktree's branch
+        for wt in parse_worktree_porcelain(&result.stdout) {
+            features.push(worktree_feature(
+                wt.path.to_string(),
+                wt.branch,
+                &canonical_repo,
+                repo_name,
+            ));
         }
 
-        // Handle last worktree if no trailing newline
-        if let Some(wt_path) = current_worktree.take() {
-            let branch = current_branch.take().unwrap_or_default();
-            let branch = branch
-                .strip_prefix("refs/heads/")
-                .unwrap_or(&branch)
-                .to_string();
-            let canonical_wt = std::fs::canonicalize(&wt_path)
-                .unwrap_or_else(|_| PathBuf::from(&wt_path));
-            let is_main = canonical_wt == canonical_repo;
-            let name = if is_main {
-                if branch.is_empty() { repo_name.clone() } else { branch.clone() }
-            } else {
-                Path::new(&wt_path)
-                    .file_name()
-                    .unwrap_or_default()
-                    .to_string_lossy()
-                    .to_string()
-            };
-            features.push(Feature {
-                name,
-                worktree_path: wt_path,
-                branch,
-                is_active: false,
-                is_main,
-            });
+        // Also check the worktrees directory for this repo
+        let unregistered = self.unregistered_features(repo_name, &features).await?;
+        features.extend(unregistered);
+
+        Ok(features)
+    }
+
+    /// Directories under the repo's worktrees dir that are not among the
+    /// `registered` worktrees.
+    async fn unregistered_features(
+        &self,
+        repo_name: &str,
+        registered: &[Feature],
+    ) -> Result<Vec<Feature>> {
+        let mut features = Vec::new();
+        let repo_worktrees_dir = self.worktrees_dir.join(repo_name);
+        if !repo_worktrees_dir.exists() {
+            return Ok(features);
         }
 
-        // Also check the worktrees directory for this repo
-        let repo_worktrees_dir = self.worktrees_dir.join(&repo_name);
-        if repo_worktrees_dir.exists() {
-            let existing_paths: std::collections::HashSet<String> =
-                features.iter().map(|f| f.worktree_path.clone()).collect();
-
-            let mut entries = tokio::fs::read_dir(&repo_worktrees_dir).await?;
-            while let Some(entry) = entries.next_entry().await? {
-                let path = entry.path();
-                if path.is_dir() && !existing_paths.contains(&path.to_string_lossy().to_string()) {
-                    let branch = self.get_current_branch(&path).await;
-                    features.push(Feature {
-                        name: path.file_name().unwrap_or_default().to_string_lossy().to_string(),
-                        worktree_path: path.to_string_lossy().to_string(),
-                        branch,
-                        is_active: false,
-                        is_main: false,
-                    });
-                }
+        let existing_paths: HashSet<String> =
+            registered.iter().map(|f| f.worktree_path.clone()).collect();
+
+        let mut entries = tokio::fs::read_dir(&repo_worktrees_dir).await?;
+        while let Some(entry) = entries.next_entry().await? {
+            let path = entry.path();
+            if path.is_dir() && !existing_paths.contains(&path.to_string_lossy().to_string()) {
+                features.push(unregistered_feature(&path).await);
             }
         }
 
         Ok(features)
     }
 
+    /// Look up a single feature by name.
+    ///
+    /// Same resolution order as `list_features` (registered worktrees first, then
+    /// directories under the repo's worktrees dir), but stops at the first match
+    /// and probes only `<worktrees_dir>/<repo>/<name>` instead of scanning every
+    /// directory and resolving each one's branch.
+    pub async fn get_feature(&self, repo_path: &str, name: &str) -> Result<Option<Feature>> {
+        let repo_path_obj = PathBuf::from(repo_path);
+        let repo_name = repo_path_obj
+            .file_name()
+            .unwrap_or_default()
+            .to_string_lossy()
+            .to_string();
+
+        let canonical_repo = std::fs::canonicalize(repo_path)
+            .unwrap_or_else(|_| PathBuf::from(repo_path));
+
+        let result = exec("git", &["worktree", "list", "--porcelain"], Some(repo_path)).await;
+        if !result.success() {
+            return Ok(None);
+        }
+
+        for wt in parse_worktree_porcelain(&result.stdout) {
+            let feature = worktree_feature(wt.path.to_string(), wt.branch, &canonical_repo, &repo_name);
+            if feature.name == name {
+                return Ok(Some(feature));
+            }
+        }
+
+        if !is_worktree_dir_name(name) {
+            return Ok(None);
+        }
+        let path = self.worktrees_dir.join(&repo_name).join(name);
+        if path.is_dir() {
+            return Ok(Some(unregistered_feature(&path).await));
+        }
+
+        Ok(None)
+    }
+
     /// List all branches (local and remote) for a repository, excluding those already in a worktree.
     pub async fn list_branches(&self, repo_path: &str) -> Result<(Vec<BranchInfo>, String)> {
         // Fetch latest (ignore errors if offline)
-        run("git fetch --all 2>/dev/null || true", Some(repo_path)).await;
+        exec_status("git", &["fetch", "--all"], Some(repo_path)).await;
 
         // Get branches already used by worktrees
-        let wt_result = run("git worktree list --porcelain", Some(repo_path)).await;
+        let wt_result = exec("git", &["worktree", "list", "--porcelain"], Some(repo_path)).await;
         let mut worktree_branches = std::collections::HashSet::new();
         if wt_result.success() {
-            for line in wt_result.stdout.lines() {
-                if let Some(branch_ref) = line.trim().strip_prefix("branch ") {
-                    let branch = branch_ref
-                        .strip_prefix("refs/heads/")
-                        .unwrap_or(branch_ref);
-                    worktree_branches.insert(branch.to_string());
+            for wt in parse_worktree_porcelain(&wt_result.stdout) {
+                if !wt.branch.is_empty() {
+                    worktree_branches.insert(wt.branch.to_string());
                 }
             }
         }
 
         // List local branches
-        let local_result = run(
-            "git branch --format=\"%(refname:short)\"",
+        let local_result = exec(
+            "git",
+            &["branch", "--format=%(refname:short)"],
             Some(repo_path),
         )
         .await;
@@ -278,8 +456,9 @@ impl GitService {
         }
 
         // List remote branches
-        let remote_result = run(
-            "git branch -r --format=\"%(refname:short)\"",
+        let remote_result = exec(
+            "git",
+            &["branch", "-r", "--format=%(refname:short)"],
             Some(repo_path),
         )
         .await;
@@ -334,16 +513,19 @@ impl GitService {
         let wt = worktree_path.to_string_lossy();
 
         // Try local branch first
-        let result = run(
-            &format!("git worktree add \"{wt}\" \"{branch_name}\""),
+        let result = exec(
+            "git",
+            &["worktree", "add", &wt, branch_name],
             Some(repo_path),
         )
         .await;
 
         if !result.success() {
             // Try tracking remote branch
-            let result = run(
-                &format!("git worktree add --track -b \"{branch_name}\" \"{wt}\" \"origin/{branch_name}\""),
+            let remote_branch = format!("origin/{branch_name}");
+            let result = exec(
+                "git",
+                &["worktree", "add", "--track", "-b", branch_name, &wt, &remote_branch],
                 Some(repo_path),
             )
             .await;
@@ -356,6 +538,7 @@ impl GitService {
             }
         }
 
+        self.invalidate_features(repo_path);
         Ok((worktree_path.to_string_lossy().to_string(), branch_name.to_string()))
     }
 
@@ -373,6 +556,13 @@ impl GitService {
             .to_string_lossy()
             .to_string();
 
+        // Both end up as positional git arguments; with a leading dash git
+        // would parse them as options (e.g. fetch --upload-pack=...)
+        reject_option_like("branch name", branch_name)?;
+        if let Some(b) = base_branch {
+            reject_option_like("base branch", b)?;
+        }
+
         // Auto-detect default branch if not specified
         let base = match base_branch {
             Some(b) if !b.is_empty() => b.to_string(),
@@ -390,52 +580,33 @@ impl GitService {
             return Ok((worktree_path.to_string_lossy().to_string(), branch_name.to_string()));
         }
 
-        // Fetch latest from remote (ignore errors)
-        run("git fetch --all 2>/dev/null || true", Some(repo_path)).await;
-
-        let wt = worktree_path.to_string_lossy();
-
-        // Try to create with new branch
-        let result = run(
-            &format!("git worktree add -b \"{branch_name}\" \"{wt}\" \"{base}\""),
-            Some(repo_path),
-        )
-        .await;
+        let wt = quote(&worktree_path.to_string_lossy());
+        let branch = quote(branch_name);
+        let origin_base = quote(&format!("origin/{base}"));
+        let base = quote(&base);
+
+        // One shell for the fetch and the whole fallback chain: new branch from
+        // base, existing branch, new branch from origin/base, then from HEAD.
+        // The network fetch only runs when base does not resolve locally, and
+        // pulls just that ref; fetch errors are ignored.
+        let command = format!(
+            "git rev-parse --verify --quiet {base} >/dev/null \
+             || git fetch origin {base} 2>/dev/null; \
+             git worktree add -b {branch} {wt} {base} \
+             || git worktree add {wt} {branch} \
+             || git worktree add -b {branch} {wt} {origin_base} \
+             || git worktree add -b {branch} {wt} HEAD"
+        );
+        let result = run_command(&command, Some(repo_path), 120.0).await;
 
         if !result.success() {
-            // Branch might already exist
-            let result = run(
-                &format!("git worktree add \"{wt}\" \"{branch_name}\""),
-                Some(repo_path),
-            )
-            .await;
-
-            if !result.success() {
-                // Try with origin/base
-                let result = run(
-                    &format!("git worktree add -b \"{branch_name}\" \"{wt}\" \"origin/{base}\""),
-                    Some(repo_path),
-                )
-                .await;
-
-                if !result.success() {
-                    // Last resort: from HEAD
-                    let result = run(
-                        &format!("git worktree add -b \"{branch_name}\" \"{wt}\" HEAD"),
-                        Some(repo_path),
-                    )
-                    .await;
-
-                    if !result.success() {
-                        return Err(NomadError::CommandFailed(format!(
-                            "Failed to create worktree: {}",
-                            result.stderr
-                        )));
-                    }
-                }
-            }
+            return Err(NomadError::CommandFailed(format!(
+                "Failed to create worktree: {}",
+                result.stderr
+            )));
         }
 
+        self.invalidate_features(repo_path);
         Ok((worktree_path.to_string_lossy().to_string(), branch_name.to_string()))
     }
 
@@ -445,6 +616,14 @@ impl GitService {
         repo_path: &str,
         feature_name: &str,
     ) -> Result<bool> {
+        // The path below is handed to rm -rf: never let it leave the repo's
+        // worktrees dir (e.g. "../../repos/app" is the main clone)
+        if !is_worktree_dir_name(feature_name) {
+            return Err(NomadError::Other(format!(
+                "Invalid feature name: '{feature_name}'"
+            )));
+        }
+
         let repo_path_obj = PathBuf::from(repo_path);
         let repo_name = repo_path_obj
             .file_name()
@@ -453,82 +632,174 @@ impl GitService {
             .to_string();
 
         let worktree_path = self.worktrees_dir.join(&repo_name).join(feature_name);
-        let wt = worktree_path.to_string_lossy();
-
-        let result = run(
-            &format!("git worktree remove \"{wt}\" --force"),
-            Some(repo_path),
-        )
-        .await;
-
-        if !result.success() {
-            run("git worktree prune", Some(repo_path)).await;
-
-            if worktree_path.exists() {
-                tokio::fs::remove_dir_all(&worktree_path).await.ok();
-            }
-        }
-
-        // Delete the branch
-        let branch_name = format!("feature/{feature_name}");
-        run(
-            &format!("git branch -D \"{branch_name}\""),
+        let wt = quote(&worktree_path.to_string_lossy());
+        let branch = quote(&format!("feature/{feature_name}"));
+
+        // Remove the worktree, then delete the branch, all in one shell. If git
+        // refuses (it no longer knows the worktree), delete the directory with
+        // rm -rf and prune the stale metadata left behind. Removing a large
+        // worktree (node_modules, build output) can take a while, so this gets
+        // the same budget as creating one rather than the usual 30s.
+        run_status(
+            &format!(
+                "git worktree remove {wt} --force \
+                 || {{ rm -rf {wt}; git worktree prune; }}; \
+                 git branch -D {branch}"
+            ),
             Some(repo_path),
+            120.0,
         )
         .await;
 
+        self.invalidate_features(repo_path);
         Ok(true)
     }
 
     /// Get the current branch of a repository.
     async fn get_current_branch(&self, repo_path: &Path) -> String {
-        let result = run(
-            "git rev-parse --abbrev-ref HEAD",
-            Some(&repo_path.to_string_lossy()),
-        )
-        .await;
-        if result.success() {
-            result.stdout.trim().to_string()
-        } else {
-            "unknown".to_string()
-        }
+        current_branch(repo_path).await
     }
 
     /// Get the default branch of a repository.
+    ///
+    /// Resolved from the ref files alone, without spawning git: origin's HEAD,
+    /// then the first of main/master/develop/dev that exists (loose or packed),
+    /// then the current branch.
     pub async fn get_default_branch(&self, repo_path: &str) -> String {
-        // Try to get from remote HEAD
-        let result = run(
-            "git symbolic-ref refs/remotes/origin/HEAD 2>/dev/null | sed 's@^refs/remotes/origin/@@'",
-            Some(repo_path),
-        )
-        .await;
-        if result.success() {
-            let branch = result.stdout.trim();
-            if !branch.is_empty() {
-                return branch.to_string();
+        let Some(git_dir) = resolve_git_dir(Path::new(repo_path)).await else {
+            return "main".to_string();
+        };
+        let common_dir = resolve_common_dir(&git_dir).await;
+
+        if let Ok(head) =
+            tokio::fs::read_to_string(common_dir.join("refs/remotes/origin/HEAD")).await
+        {
+            if let Some(branch) = head.trim().strip_prefix("ref: refs/remotes/origin/") {
+                if !branch.is_empty() {
+                    return branch.to_string();
+                }
             }
         }
 
         // Check common branches
+        let packed_refs = tokio::fs::read_to_string(common_dir.join("packed-refs"))
+            .await
+            .unwrap_or_default();
         for branch in &["main", "master", "develop", "dev"] {
-            let result = run(
-                &format!("git rev-parse --verify \"{branch}\" 2>/dev/null"),
-                Some(repo_path),
-            )
-            .await;
-            if result.success() {
+            let ref_name = format!("refs/heads/{branch}");
+            let loose = tokio::fs::metadata(common_dir.join(&ref_name))
+                .await
+                .is_ok_and(|m| m.is_file());
+            let packed = packed_refs
+                .lines()
+                .any(|line| line.split_once(' ').is_some_and(|(_, name)| name == ref_name));
+            if loose || packed {
                 return branch.to_string();
             }
         }
 
-        // Fall back to current branch
-        let result = run("git rev-parse --abbrev-ref HEAD", Some(repo_path)).await;
-        if result.success() {
-            return result.stdout.trim().to_string();
+        // Fall back to current branch ("HEAD" when detached, like rev-parse)
+        match tokio::fs::read_to_string(git_dir.join("HEAD")).await {
+            Ok(head) => head
+                .trim()
+                .strip_prefix("ref: refs/heads/")
+                .unwrap_or("HEAD")
+                .to_string(),
+            Err(_) => "main".to_string(),
         }
+    }
+}
+
+/// Current branch of a repository or worktree.
+///
+/// Reads `HEAD` straight from the git dir, which is all `git rev-parse
+/// --abbrev-ref HEAD` does for a checked-out branch; git is only spawned
+/// for anything else (detached HEAD, unreadable git dir).
+async fn current_branch(repo_path: &Path) -> String {
+    if let Some(branch) = read_head_branch(repo_path).await {
+        return branch;
+    }
+
+    let result = exec(
+        "git",
+        &["rev-parse", "--abbrev-ref", "HEAD"],
+        Some(&repo_path.to_string_lossy()),
+    )
+    .await;
+    if result.success() {
+        result.stdout.trim().to_string()
+    } else {
+        "unknown".to_string()
+    }
+}
 
-        "main".to_string()
+/// Resolve the git dir of a repository or worktree.
+/// For linked worktrees `.git` is a file holding `gitdir: <path>`.
+async fn resolve_git_dir(repo_path: &Path) -> Option<PathBuf> {
+    let dot_git = repo_path.join(".git");
+    let metadata = tokio::fs::metadata(&dot_git).await.ok()?;
+    if metadata.is_dir() {
+        return Some(dot_git);
     }
+
+    let content = tokio::fs::read_to_string(&dot_git).await.ok()?;
+    let gitdir = content.trim().strip_prefix("gitdir:")?.trim();
+    Some(repo_path.join(gitdir))
+}
+
+/// Directory holding the refs shared by all worktrees of a repository.
+/// A linked worktree's git dir names it in its `commondir` file.
+async fn resolve_common_dir(git_dir: &Path) -> PathBuf {
+    match tokio::fs::read_to_string(git_dir.join("commondir")).await {
+        Ok(content) => git_dir.join(content.trim()),
+        Err(_) => git_dir.to_path_buf(),
+    }
+}
+
+/// Branch name from `<gitdir>/HEAD`, or `None` if HEAD is not a symbolic ref
+/// to a local branch.
+async fn read_head_branch(repo_path: &Path) -> Option<String> {
+    let git_dir = resolve_git_dir(repo_path).await?;
+    let head = tokio::fs::read_to_string(git_dir.join("HEAD")).await.ok()?;
+    let branch = head.trim().strip_prefix("ref: refs/heads/")?;
+    Some(branch.to_string())
+}
+
+/// Build a feature for a directory under the worktrees dir that git does not list.
+/// Its branch comes from its own HEAD file; such directories are usually stale
+/// (their git dir was pruned), so there is nothing for a git subprocess to add.
+async fn unregistered_feature(path: &Path) -> Feature {
+    let branch = read_head_branch(path)
+        .await
+        .unwrap_or_else(|| "unknown".to_string());
+    Feature {
+        name: path.file_name().unwrap_or_default().to_string_lossy().to_string(),
+        worktree_path: path.to_string_lossy().to_string(),
+        branch,
+        is_active: false,
+        is_main: false,
+    }
+}
+
+/// Repository name from a clone URL: its last path segment without `.git`.
+/// Whether `name` is a direct child of a repo's worktrees dir, as
+/// list_features would find it: no traversal out of it via "..", "/" or "".
+fn is_worktree_dir_name(name: &str) -> bool {
+    !(name.is_empty() || name == "." || name == ".." || name.contains('/'))
+}
+
+/// Refuse a user-supplied ref that git would read as an option.
+fn reject_option_like(what: &str, value: &str) -> Result<()> {
+    if value.starts_with('-') {
+        return Err(NomadError::Other(format!("Invalid {what}: '{value}'")));
+    }
+    Ok(())
+}
+
+fn repo_name_from_url(url: &str) -> Option<&str> {
+    let segment = url.trim_end_matches('/').rsplit('/').next()?;
+    let stem = segment.strip_suffix(".git").unwrap_or(segment);
+    (!stem.is_empty()).then_some(stem)
 }
 
 /// Sanitize a repository name: replace non-alphanumeric chars (except ._-) with dashes.
@@ -576,6 +847,61 @@ pub fn derive_worktree_name(branch_name: &str, worktrees_dir: &Path) -> String {
     base // unreachable in practice
 }
 
+/// One entry of `git worktree list --porcelain`.
+struct PorcelainWorktree<'a> {
+    path: &'a str,
+    /// Short branch name, empty for a detached or bare worktree.
+    branch: &'a str,
+}
+
+/// Parse `git worktree list --porcelain` output, whose entries are blocks of
+/// `<key> <value>` lines separated by blank lines.
+fn parse_worktree_porcelain(output: &str) -> impl Iterator<Item = PorcelainWorktree<'_>> {
+    output.split("\n\n").filter_map(|block| {
+        let mut path = None;
+        let mut branch = "";
+        for line in block.lines() {
+            match line.trim().split_once(' ') {
+                Some(("worktree", rest)) => path = Some(rest),
+                Some(("branch", rest)) => branch = rest.strip_prefix("refs/heads/").unwrap_or(rest),
+                _ => {}
+            }
+        }
+        path.map(|path| PorcelainWorktree { path, branch })
+    })
+}
+
+/// Build a feature from one `git worktree list --porcelain` entry.
+/// The main worktree is named after its branch, others after their directory.
+fn worktree_feature(wt_path: String, branch: &str, canonical_repo: &Path, repo_name: &str) -> Feature {
+    let branch = branch.to_string();
+
+    let canonical_wt = std::fs::canonicalize(&wt_path)
+        .unwrap_or_else(|_| PathBuf::from(&wt_path));
+    let is_main = canonical_wt == canonical_repo;
+    let name = if is_main {
+        if branch.is_empty() {
+            repo_name.to_string()
+        } else {
+            branch.clone()
+        }
+    } else {
+        Path::new(&wt_path)
+            .file_name()
+            .unwrap_or_default()
+            .to_string_lossy()
+            .to_string()
+    };
+
+    Feature {
+        name,
+        worktree_path: wt_path,
+        branch,
+        is_active: false,
+        is_main,
+    }
+}
+
 /// Inject a token into a git HTTPS URL.
 fn inject_token(url: &str, token: &str) -> String {
     if let Some(rest) = url.strip_prefix("https://") {
@@ -590,6 +916,7 @@ fn inject_token(url: &str, token: &str) -> String {
 #[cfg(test)]
 mod tests {
     use super::*;
+    use crate::shell::run;
     use tempfile::TempDir;
 
     #[test]
@@ -611,6 +938,24 @@ mod tests {
         assert_eq!(derive_worktree_name("feature/add-login", dir), "add-login-3");
     }
 
+    #[test]
+    fn test_parse_worktree_porcelain() {
+        let output = "worktree /repos/app\nHEAD 1111\nbranch refs/heads/main\n\n\
+                      worktree /worktrees/app/detached\nHEAD 2222\ndetached\n\n\
+                      worktree /worktrees/app/with space\nHEAD 3333\nbranch refs/heads/feature/x";
+        let parsed: Vec<(&str, &str)> = parse_worktree_porcelain(output)
+            .map(|wt| (wt.path, wt.branch))
+            .collect();
+        assert_eq!(
+            parsed,
+            vec![
+                ("/repos/app", "main"),
+                ("/worktrees/app/detached", ""),
+                ("/worktrees/app/with space", "feature/x"),
+            ]
+        );
+    }
+
     #[test]
     fn test_sanitize_name() {
         assert_eq!(sanitize_name("my repo@v2!"), "my-repo-v2-");
@@ -618,6 +963,14 @@ mod tests {
         assert_eq!(sanitize_name("with.dots_and-dashes"), "with.dots_and-dashes");
     }
 
+    #[test]
+    fn test_repo_name_from_url() {
+        assert_eq!(repo_name_from_url("https://github.com/user/repo.git"), Some("repo"));
+        assert_eq!(repo_name_from_url("https://github.com/user/socket.io/"), Some("socket.io"));
+        assert_eq!(repo_name_from_url("git@github.com:user/repo.git"), Some("repo"));
+        assert_eq!(repo_name_from_url(""), None);
+    }
+
     #[test]
     fn test_inject_token() {
         assert_eq!(
@@ -626,6 +979,51 @@ mod tests {
         );
     }
 
+    #[tokio::test]
+    async fn test_clone_repo_url_is_not_an_option() {
+        let tmp = TempDir::new().unwrap();
+        let settings = Settings {
+            paths: crate::config::PathsConfig {
+                base_dir: tmp.path().to_string_lossy().to_string(),
+            },
+            ..Default::default()
+        };
+        settings.ensure_directories().unwrap();
+        let svc = GitService::new(&settings);
+
+        // After "--" git takes this as a (nonexistent) repository path, never
+        // as --upload-pack, so the clone fails without running the command.
+        let marker = tmp.path().join("injected");
+        let url = format!("--upload-pack=touch {}", marker.display());
+        let result = svc.clone_repo(&url, None, Some("dash")).await;
+        assert!(matches!(result, Err(NomadError::CommandFailed(_))));
+        assert!(!marker.exists());
+        assert!(!settings.repos_dir().join("dash").exists());
+
+        // Same for the refs create_feature hands to rev-parse/fetch/worktree,
+        // even with an origin that fetch would happily contact
+        let origin_dir = tmp.path().join("origin");
+        let repo_dir = settings.repos_dir().join("test-repo");
+        for dir in [&origin_dir, &repo_dir] {
+            std::fs::create_dir_all(dir).unwrap();
+            run("git init", Some(&dir.to_string_lossy())).await;
+            run("git commit --allow-empty -m init", Some(&dir.to_string_lossy())).await;
+        }
+        run(
+            &format!("git remote add origin {}", quote(&origin_dir.to_string_lossy())),
+            Some(&repo_dir.to_string_lossy()),
+        )
+        .await;
+
+        let repo_path = repo_dir.to_string_lossy().to_string();
+        let opt = format!("--upload-pack=touch {};git-upload-pack", marker.display());
+        let result = svc.create_feature(&repo_path, "feature/x", Some(&opt)).await;
+        assert!(result.is_err());
+        let result = svc.create_feature(&repo_path, &opt, None).await;
+        assert!(result.is_err());
+        assert!(!marker.exists());
+    }
+
     #[tokio::test]
     async fn test_list_repos_empty_dir() {
         let tmp = TempDir::new().unwrap();
@@ -686,6 +1084,71 @@ mod tests {
         assert_ne!(branch, "unknown");
     }
 
+    #[tokio::test]
+    async fn test_read_head_branch() {
+        let tmp = TempDir::new().unwrap();
+        let repo_dir = tmp.path().join("repo");
+        std::fs::create_dir_all(&repo_dir).unwrap();
+        let repo = repo_dir.to_string_lossy().to_string();
+
+        run("git init -b trunk", Some(&repo)).await;
+        run("git commit --allow-empty -m init", Some(&repo)).await;
+        assert_eq!(read_head_branch(&repo_dir).await.as_deref(), Some("trunk"));
+
+        // Linked worktree: `.git` is a file pointing at the real git dir
+        let wt_dir = tmp.path().join("wt");
+        run(
+            &format!("git worktree add -b feature/x \"{}\"", wt_dir.display()),
+            Some(&repo),
+        )
+        .await;
+        assert_eq!(read_head_branch(&wt_dir).await.as_deref(), Some("feature/x"));
+
+        // Detached HEAD is left to git
+        run("git checkout --detach", Some(&repo)).await;
+        assert_eq!(read_head_branch(&repo_dir).await, None);
+        let svc = GitService::new(&Settings::default());
+        assert_eq!(svc.get_current_branch(&repo_dir).await, "HEAD");
+    }
+
+    #[tokio::test]
+    async fn test_get_default_branch() {
+        let tmp = TempDir::new().unwrap();
+        let repo_dir = tmp.path().join("repo");
+        std::fs::create_dir_all(&repo_dir).unwrap();
+        let repo = repo_dir.to_string_lossy().to_string();
+        let svc = GitService::new(&Settings::default());
+
+        run("git init -b trunk", Some(&repo)).await;
+        run("git commit --allow-empty -m init", Some(&repo)).await;
+        // No well-known branch: current branch
+        assert_eq!(svc.get_default_branch(&repo).await, "trunk");
+
+        // Packed refs are found too
+        run("git branch develop && git pack-refs --all", Some(&repo)).await;
+        assert!(!repo_dir.join(".git/refs/heads/develop").exists());
+        assert_eq!(svc.get_default_branch(&repo).await, "develop");
+
+        // origin's HEAD wins, also when asked from a linked worktree
+        run(
+            "git update-ref refs/remotes/origin/release HEAD \
+             && git symbolic-ref refs/remotes/origin/HEAD refs/remotes/origin/release",
+            Some(&repo),
+        )
+        .await;
+        let wt_dir = tmp.path().join("wt");
+        run(
+            &format!("git worktree add -b feature/x \"{}\"", wt_dir.display()),
+            Some(&repo),
+        )
+        .await;
+        assert_eq!(svc.get_default_branch(&repo).await, "release");
+        assert_eq!(
+            svc.get_default_branch(&wt_dir.to_string_lossy()).await,
+            "release"
+        );
+    }
+
     use crate::config::Settings;
 
     #[tokio::test]
@@ -731,6 +1194,144 @@ mod tests {
         assert!(main.is_some());
     }
 
+    #[tokio::test]
+    async fn test_stream_features() {
+        let tmp = TempDir::new().unwrap();
+        let settings = Settings {
+            paths: crate::config::PathsConfig {
+                base_dir: tmp.path().to_string_lossy().to_string(),
+            },
+            ..Default::default()
+        };
+        settings.ensure_directories().unwrap();
+
+        let repo_dir = settings.repos_dir().join("test-repo");
+        std::fs::create_dir_all(&repo_dir).unwrap();
+        run("git init", Some(&repo_dir.to_string_lossy())).await;
+        run(
+            "git commit --allow-empty -m init",
+            Some(&repo_dir.to_string_lossy()),
+        )
+        .await;
+
+        let svc = GitService::new(&settings);
+        let repo_path = repo_dir.to_string_lossy().to_string();
+        svc.create_feature(&repo_path, "feature/streamed", None)
+            .await
+            .unwrap();
+        std::fs::create_dir_all(settings.worktrees_dir().join("test-repo/unregistered")).unwrap();
+
+        async fn streamed_names(svc: &GitService, repo_path: &str) -> Vec<String> {
+            let (tx, mut rx) = mpsc::channel(1);
+            let (result, names) = tokio::join!(svc.stream_features(repo_path, tx), async {
+                let mut names = Vec::new();
+                while let Some(feature) = rx.recv().await {
+                    names.push(feature.name);
+                }
+                names
+            });
+            result.unwrap();
+            names
+        }
+
+        // Live scan, then the cached list it left behind: same as list_features
+        let expected: Vec<String> = svc
+            .list_features(&repo_path)
+            .await
+            .unwrap()
+            .into_iter()
+            .map(|f| f.name)
+            .collect();
+        assert_eq!(expected.len(), 3);
+        svc.invalidate_features(&repo_path);
+        assert_eq!(streamed_names(&svc, &repo_path).await, expected);
+        assert_eq!(streamed_names(&svc, &repo_path).await, expected);
+
+        // A receiver that goes away just ends the stream
+        let (tx, rx) = mpsc::channel(1);
+        drop(rx);
+        svc.invalidate_features(&repo_path);
+        svc.stream_features(&repo_path, tx).await.unwrap();
+    }
+
+    #[tokio::test]
+    async fn test_list_features_cache_tracks_external_changes() {
+        let tmp = TempDir::new().unwrap();
+        let settings = Settings {
+            paths: crate::config::PathsConfig {
+                base_dir: tmp.path().to_string_lossy().to_string(),
+            },
+            ..Default::default()
+        };
+        settings.ensure_directories().unwrap();
+
+        let repo_dir = settings.repos_dir().join("test-repo");
+        std::fs::create_dir_all(&repo_dir).unwrap();
+        let repo_path = repo_dir.to_string_lossy().to_string();
+        run("git init", Some(&repo_path)).await;
+        run("git commit --allow-empty -m init", Some(&repo_path)).await;
+
+        let svc = GitService::new(&settings);
+        assert_eq!(svc.list_features(&repo_path).await.unwrap().len(), 1);
+
+        // Worktree added behind the service's back
+        let wt_dir = settings.worktrees_dir().join("test-repo").join("outside");
+        run(
+            &format!("git worktree add -b feature/outside \"{}\"", wt_dir.display()),
+            Some(&repo_path),
+        )
+        .await;
+        let features = svc.list_features(&repo_path).await.unwrap();
+        assert!(features.iter().any(|f| f.branch == "feature/outside"));
+
+        // Branch switched inside an existing worktree
+        run("git checkout -b feature/renamed", Some(&wt_dir.to_string_lossy())).await;
+        let features = svc.list_features(&repo_path).await.unwrap();
+        assert!(features.iter().any(|f| f.branch == "feature/renamed"));
+    }
+
+    #[tokio::test]
+    async fn test_get_feature() {
+        let tmp = TempDir::new().unwrap();
+        let settings = Settings {
+            paths: crate::config::PathsConfig {
+                base_dir: tmp.path().to_string_lossy().to_string(),
+            },
+            ..Default::default()
+        };
+        settings.ensure_directories().unwrap();
+
+        let repo_dir = settings.repos_dir().join("test-repo");
+        std::fs::create_dir_all(&repo_dir).unwrap();
+        run("git init", Some(&repo_dir.to_string_lossy())).await;
+        run(
+            "git commit --allow-empty -m init",
+            Some(&repo_dir.to_string_lossy()),
+        )
+        .await;
+
+        let svc = GitService::new(&settings);
+        let repo_path = repo_dir.to_string_lossy().to_string();
+        svc.create_feature(&repo_path, "feature/lookup", None)
+            .await
+            .unwrap();
+
+        let feat = svc.get_feature(&repo_path, "lookup").await.unwrap().unwrap();
+        assert_eq!(feat.branch, "feature/lookup");
+        assert!(!feat.is_main);
+
+        assert!(svc.get_feature(&repo_path, "missing").await.unwrap().is_none());
+
+        // Names that would escape the repo's worktrees dir never resolve
+        std::fs::create_dir_all(settings.worktrees_dir().join("other-repo/x")).unwrap();
+        for name in ["", ".", "..", "../other-repo", "../other-repo/x", "lookup/.."] {
+            assert!(
+                svc.get_feature(&repo_path, name).await.unwrap().is_none(),
+                "{name:?} should not resolve"
+            );
+        }
+    }
+
     #[tokio::test]
     async fn test_delete_feature() {
         let tmp = TempDir::new().unwrap();
@@ -760,5 +1361,23 @@ mod tests {
             .unwrap();
         let deleted = svc.delete_feature(&repo_path, "to-delete").await.unwrap();
         assert!(deleted);
+        let wt_dir = settings.worktrees_dir().join("test-repo");
+        assert!(!wt_dir.join("to-delete").exists());
+
+        // A directory git doesn't know about is removed as well
+        std::fs::create_dir_all(wt_dir.join("stale/node_modules")).unwrap();
+        svc.delete_feature(&repo_path, "stale").await.unwrap();
+        assert!(!wt_dir.join("stale").exists());
+
+        // Names that would point outside the worktrees dir are refused,
+        // leaving the main clone (and everything else) in place
+        for name in ["", ".", "..", "../../repos/test-repo", "a/b"] {
+            assert!(
+                svc.delete_feature(&repo_path, name).await.is_err(),
+                "{name:?} should be refused"
+            );
+        }
+        assert!(repo_dir.join(".git").exists());
+        assert!(wt_dir.exists());
     }
 }
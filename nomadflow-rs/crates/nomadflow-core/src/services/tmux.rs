@@ -1,5 +1,5 @@
 use crate::error::{NomadError, Result};
-use crate::shell::{command_exists, run};
+use crate::shell::{command_exists, exec, exec_status, quote};
 
 pub struct TmuxService {
     session_name: String,
@@ -20,24 +20,16 @@ impl TmuxService {
             ));
         }
 
-        let result = run(
-            &format!("tmux has-session -t \"{}\" 2>/dev/null", self.session_name),
-            None,
-        )
-        .await;
-
-        if !result.success() {
-            let result = run(
-                &format!("tmux new-session -d -s \"{}\"", self.session_name),
-                None,
-            )
-            .await;
-            if !result.success() {
-                return Err(NomadError::CommandFailed(format!(
-                    "Failed to create tmux session: {}",
-                    result.stderr
-                )));
-            }
+        // Create unconditionally and treat "already exists" as success: one
+        // call instead of has-session + new-session, and no race between them.
+        // (`new-session -A` would try to attach to an existing session, which
+        // fails without a terminal.)
+        let result = exec("tmux", &["new-session", "-d", "-s", &self.session_name], None).await;
+        if !result.success() && !result.stderr.contains("duplicate session") {
+            return Err(NomadError::CommandFailed(format!(
+                "Failed to create tmux session: {}",
+                result.stderr
+            )));
         }
 
         Ok(true)
@@ -45,11 +37,15 @@ impl TmuxService {
 
     /// List all windows in the session.
     pub async fn list_windows(&self) -> Vec<TmuxWindow> {
-        let result = run(
-            &format!(
-                "tmux list-windows -t \"{}\" -F \"#{{window_index}}:#{{window_name}}\"",
-                self.session_name
-            ),
+        let result = exec(
+            "tmux",
+            &[
+                "list-windows",
+                "-t",
+                &self.session_name,
+                "-F",
+                "#{window_index}:#{window_name}",
+            ],
             None,
         )
         .await;
@@ -72,15 +68,12 @@ impl TmuxService {
 
     /// Create a new window in the session.
     pub async fn create_window(&self, name: &str, working_dir: Option<&str>) -> Result<()> {
-        let mut cmd = format!(
-            "tmux new-window -t \"{}\" -n \"{}\"",
-            self.session_name, name
-        );
+        let mut args = vec!["new-window", "-t", &self.session_name, "-n", name];
         if let Some(dir) = working_dir {
-            cmd.push_str(&format!(" -c \"{dir}\""));
+            args.extend(["-c", dir]);
         }
 
-        let result = run(&cmd, None).await;
+        let result = exec("tmux", &args, None).await;
         if !result.success() {
             return Err(NomadError::CommandFailed(format!(
                 "Failed to create tmux window: {}",
@@ -92,50 +85,57 @@ impl TmuxService {
 
     /// Select/focus a window by name.
     pub async fn select_window(&self, name: &str) -> bool {
-        run(
-            &format!("tmux select-window -t \"{}:{}\"", self.session_name, name),
-            None,
-        )
-        .await
-        .success()
+        let target = self.target(name);
+        exec_status("tmux", &["select-window", "-t", &target], None).await
     }
 
     /// Kill a window by name.
     pub async fn kill_window(&self, name: &str) -> bool {
-        run(
-            &format!("tmux kill-window -t \"{}:{}\"", self.session_name, name),
-            None,
-        )
-        .await
-        .success()
+        let target = self.target(name);
+        exec_status("tmux", &["kill-window", "-t", &target], None).await
     }
 
     /// Send keys to a window.
     pub async fn send_keys(&self, window: &str, keys: &str, enter: bool) -> bool {
-        let enter_arg = if enter { " Enter" } else { "" };
-        run(
-            &format!(
-                "tmux send-keys -t \"{}:{}\" \"{}\"{}",
-                self.session_name, window, keys, enter_arg
-            ),
-            None,
-        )
-        .await
-        .success()
+        let target = self.target(window);
+        let mut args = vec!["send-keys", "-t", &target, keys];
+        if enter {
+            args.push("Enter");
+        }
+        exec_status("tmux", &args, None).await
+    }
+
+    /// Type several lines into a window, pressing Enter after each, with a
+    /// single `tmux send-keys` call.
+    pub async fn send_lines(&self, window: &str, lines: &[&str]) -> bool {
+        let target = self.target(window);
+        let mut args = vec!["send-keys", "-t", &target];
+        for line in lines {
+            args.extend([*line, "Enter"]);
+        }
+        exec_status("tmux", &args, None).await
     }
 
     /// Check if a window exists.
+    ///
+    /// Probes the exact `=session:=window` target with `has-session`, which
+    /// fails when the window is missing, instead of listing every window.
+    /// tmux reads a `.` in the target as a pane separator, so such names
+    /// still go through the list.
     pub async fn window_exists(&self, name: &str) -> bool {
-        self.list_windows().await.iter().any(|w| w.name == name)
+        if name.contains('.') {
+            return self.list_windows().await.iter().any(|w| w.name == name);
+        }
+        let target = format!("={}:={}", self.session_name, name);
+        exec_status("tmux", &["has-session", "-t", &target], None).await
     }
 
     /// Get the current command running in the window's active pane.
     pub async fn get_pane_command(&self, window: &str) -> Option<String> {
-        let result = run(
-            &format!(
-                "tmux list-panes -t \"{}:{}\" -F \"#{{pane_current_command}}\"",
-                self.session_name, window
-            ),
+        let target = self.target(window);
+        let result = exec(
+            "tmux",
+            &["list-panes", "-t", &target, "-F", "#{pane_current_command}"],
             None,
         )
         .await;
@@ -150,23 +150,48 @@ impl TmuxService {
 
     /// Check if the window has an idle shell.
     pub async fn is_shell_idle(&self, window: &str) -> bool {
-        match self.get_pane_command(window).await {
-            None => true,
-            Some(cmd) => {
-                const IDLE_SHELLS: &[&str] =
-                    &["bash", "zsh", "sh", "fish", "dash", "ksh", "tcsh", "csh"];
-                IDLE_SHELLS.contains(&cmd.to_lowercase().as_str())
-            }
+        is_idle_shell(self.get_pane_command(window).await.as_deref())
+    }
+
+    /// Name and active pane command of every window, from a single tmux call.
+    async fn list_window_commands(&self) -> Vec<(String, String)> {
+        let result = exec(
+            "tmux",
+            &[
+                "list-windows",
+                "-t",
+                &self.session_name,
+                "-F",
+                "#{window_name}\t#{pane_current_command}",
+            ],
+            None,
+        )
+        .await;
+
+        if !result.success() {
+            return Vec::new();
         }
+        result
+            .stdout
+            .lines()
+            .filter_map(|line| line.split_once('\t'))
+            .map(|(name, command)| (name.to_string(), command.to_string()))
+            .collect()
     }
 
     /// Ensure a window exists, create if not.
     pub async fn ensure_window(&self, name: &str, working_dir: Option<&str>) -> Result<()> {
         if !self.window_exists(name).await {
-            self.create_window(name, working_dir).await?;
-            if let Some(dir) = working_dir {
-                self.send_keys(name, &format!("cd \"{dir}\""), true).await;
-            }
+            self.open_window(name, working_dir).await?;
+        }
+        Ok(())
+    }
+
+    /// Create a window and cd into its working directory.
+    async fn open_window(&self, name: &str, working_dir: Option<&str>) -> Result<()> {
+        self.create_window(name, working_dir).await?;
+        if let Some(dir) = working_dir {
+            self.send_keys(name, &format!("cd {}", quote(dir)), true).await;
         }
         Ok(())
     }
@@ -178,14 +203,21 @@ impl TmuxService {
         name: &str,
         working_dir: Option<&str>,
     ) -> Result<(bool, bool)> {
-        let window_existed = self.window_exists(name).await;
-        let mut has_running_process = false;
-
-        if window_existed {
-            has_running_process = !self.is_shell_idle(name).await;
-        }
-
-        self.ensure_window(name, working_dir).await?;
+        // One listing answers both "does it exist" and "is its shell idle"
+        let pane_command = self
+            .list_window_commands()
+            .await
+            .into_iter()
+            .find(|(window, _)| window == name)
+            .map(|(_, command)| command);
+
+        let has_running_process = match &pane_command {
+            Some(command) => !is_idle_shell(Some(command)),
+            None => {
+                self.open_window(name, working_dir).await?;
+                false
+            }
+        };
 
         let selected = self.select_window(name).await;
         if !selected {
@@ -195,14 +227,19 @@ impl TmuxService {
         // Only CD and clear if shell is idle
         if let Some(dir) = working_dir {
             if !has_running_process {
-                self.send_keys(name, &format!("cd \"{dir}\""), true).await;
-                self.send_keys(name, "clear", true).await;
+                self.send_lines(name, &[&format!("cd {}", quote(dir)), "clear"])
+                    .await;
             }
         }
 
         Ok((true, has_running_process))
     }
 
+    /// `session:window` target for tmux `-t`.
+    fn target(&self, window: &str) -> String {
+        format!("{}:{}", self.session_name, window)
+    }
+
     pub fn session_name(&self) -> &str {
         &self.session_name
     }
@@ -214,18 +251,30 @@ pub struct TmuxWindow {
     pub name: String,
 }
 
+/// Whether a pane's current command is a shell waiting for input.
+fn is_idle_shell(command: Option<&str>) -> bool {
+    const IDLE_SHELLS: &[&str] = &["bash", "zsh", "sh", "fish", "dash", "ksh", "tcsh", "csh"];
+    match command {
+        None | Some("") => true,
+        Some(cmd) => IDLE_SHELLS.contains(&cmd.to_lowercase().as_str()),
+    }
+}
+
 /// Build a tmux window name from repo path and feature name.
 pub fn window_name(repo_path: &str, feature_name: &str) -> String {
-    let repo_name = std::path::Path::new(repo_path)
-        .file_name()
-        .unwrap_or_default()
-        .to_string_lossy();
-    format!("{repo_name}:{feature_name}")
+    format!("{}:{feature_name}", last_path_segment(repo_path))
+}
+
+/// Last `/`-separated segment of a path, ignoring trailing slashes.
+/// Plain string slicing: no `Path` parsing or lossy conversion on the request path.
+pub fn last_path_segment(path: &str) -> &str {
+    path.trim_end_matches('/').rsplit('/').next().unwrap_or_default()
 }
 
 #[cfg(test)]
 mod tests {
     use super::*;
+    use crate::shell::run;
 
     fn tmux_available() -> bool {
         std::process::Command::new("which")
@@ -238,6 +287,7 @@ mod tests {
     #[test]
     fn test_window_name() {
         assert_eq!(window_name("/home/user/repos/my-project", "add-login"), "my-project:add-login");
+        assert_eq!(window_name("/home/user/repos/my-project/", "add-login"), "my-project:add-login");
     }
 
     #[tokio::test]
@@ -258,7 +308,8 @@ mod tests {
 
         let svc = TmuxService::new(session);
 
-        // Create session
+        // Create session; a second call finds it already there
+        svc.ensure_session().await.unwrap();
         svc.ensure_session().await.unwrap();
 
         // List windows
@@ -269,6 +320,13 @@ mod tests {
         let win = "test-lifecycle-win";
         svc.create_window(win, None).await.unwrap();
         assert!(svc.window_exists(win).await);
+        assert!(!svc.window_exists("test-lifecycle").await);
+
+        // Names built by window_name() contain ':' and may contain '.'
+        let dotted = "repo:v1.2";
+        svc.create_window(dotted, None).await.unwrap();
+        assert!(svc.window_exists(dotted).await);
+        assert!(!svc.window_exists("repo:v1").await);
 
         // Give the shell a moment to start
         tokio::time::sleep(std::time::Duration::from_millis(300)).await;
@@ -277,6 +335,18 @@ mod tests {
         let idle = svc.is_shell_idle(win).await;
         assert!(idle);
 
+        // Switching to an existing window (its busy flag depends on what the
+        // pane happens to be running at that instant, so it is not asserted)
+        let (switched, _busy) = svc.switch_to_window(win, None).await.unwrap();
+        assert!(switched);
+
+        // Switching to a missing window creates it
+        let new_win = "test-switch-win";
+        let (switched, busy) = svc.switch_to_window(new_win, Some("/tmp")).await.unwrap();
+        assert!(switched);
+        assert!(!busy);
+        assert!(svc.window_exists(new_win).await);
+
         // Cleanup: kill the entire test session (more reliable than kill_window)
         run(&format!("tmux kill-session -t \"{session}\""), None).await;
     }
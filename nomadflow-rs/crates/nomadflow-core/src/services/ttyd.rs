@@ -1,5 +1,6 @@
-use std::net::TcpListener;
+use std::time::Duration;
 
+use tokio::net::TcpStream;
 use tokio::process::{Child, Command};
 
 use crate::config::Settings;
@@ -33,7 +34,7 @@ impl TtydService {
             ));
         }
 
-        if self.port_in_use() {
+        if self.port_in_use().await {
             return Ok(());
         }
 
@@ -55,14 +56,25 @@ impl TtydService {
         cmd.stdout(std::process::Stdio::null());
         cmd.stderr(std::process::Stdio::null());
 
-        let child = cmd.spawn().map_err(|e| {
+        let mut child = cmd.spawn().map_err(|e| {
             NomadError::CommandFailed(format!("Failed to start ttyd: {e}"))
         })?;
 
-        self.process = Some(child);
+        // Wait until ttyd accepts connections (up to ~500ms, as the old fixed
+        // sleep did), bailing out early if it exits instead.
+        for _ in 0..50 {
+            if let Ok(Some(status)) = child.try_wait() {
+                return Err(NomadError::CommandFailed(format!(
+                    "ttyd exited during startup ({status})"
+                )));
+            }
+            if self.port_in_use().await {
+                break;
+            }
+            tokio::time::sleep(Duration::from_millis(10)).await;
+        }
 
-        // Give it a moment to start
-        tokio::time::sleep(std::time::Duration::from_millis(500)).await;
+        self.process = Some(child);
 
         Ok(())
     }
@@ -76,8 +88,15 @@ impl TtydService {
         self.process = None;
     }
 
-    fn port_in_use(&self) -> bool {
-        TcpListener::bind(("127.0.0.1", self.port)).is_err()
+    /// Whether something is already accepting connections on the ttyd port.
+    /// Probes with a non-blocking connect instead of a blocking bind on the
+    /// runtime thread.
+    async fn port_in_use(&self) -> bool {
+        let connect = TcpStream::connect(("127.0.0.1", self.port));
+        matches!(
+            tokio::time::timeout(Duration::from_millis(200), connect).await,
+            Ok(Ok(_))
+        )
     }
 
     pub fn port(&self) -> u16 {
@@ -1,5 +1,9 @@
+use std::collections::HashMap;
+use std::path::Path;
+use std::sync::{Mutex, OnceLock};
 use std::time::Duration;
 
+use tokio::io::{AsyncRead, AsyncReadExt};
 use tokio::process::Command;
 
 #[derive(Debug)]
@@ -15,6 +19,9 @@ impl CommandResult {
     }
 }
 
+/// Output kept per stream unless a caller asks for less.
+const DEFAULT_MAX_OUTPUT_BYTES: usize = 1 << 20;
+
 /// Run a shell command asynchronously with a timeout.
 pub async fn run_command(
     command: &str,
@@ -23,7 +30,35 @@ pub async fn run_command(
 ) -> CommandResult {
     let mut cmd = Command::new("sh");
     cmd.arg("-c").arg(command);
+    run_captured(cmd, cwd, timeout_secs, DEFAULT_MAX_OUTPUT_BYTES).await
+}
 
+/// Run a program directly with an argument vector, without an intermediate
+/// `sh -c`: one process less per call, and arguments are never re-parsed by
+/// a shell. Use `run_command` only when shell syntax is actually needed.
+///
+/// At most `max_output_bytes` are kept of stdout and of stderr: the start of
+/// stdout, and the end of stderr, where a failing command's error message
+/// is. The rest is still read (so the child never blocks on a full pipe) but
+/// discarded.
+pub async fn exec_command_capped(
+    program: &str,
+    args: &[&str],
+    cwd: Option<&str>,
+    timeout_secs: f64,
+    max_output_bytes: usize,
+) -> CommandResult {
+    let mut cmd = Command::new(program);
+    cmd.args(args);
+    run_captured(cmd, cwd, timeout_secs, max_output_bytes).await
+}
+
+async fn run_captured(
+    mut cmd: Command,
+    cwd: Option<&str>,
+    timeout_secs: f64,
+    max_output_bytes: usize,
+) -> CommandResult {
     if let Some(dir) = cwd {
         cmd.current_dir(dir);
     }
@@ -34,20 +69,24 @@ pub async fn run_command(
     let result = tokio::time::timeout(
         Duration::from_secs_f64(timeout_secs),
         async {
-            let child = cmd.spawn();
-            match child {
-                Ok(child) => child.wait_with_output().await,
-                Err(e) => Err(e),
-            }
+            let mut child = cmd.spawn()?;
+            let stdout = child.stdout.take();
+            let stderr = child.stderr.take();
+            let (stdout, stderr, status) = tokio::join!(
+                read_capped(stdout, max_output_bytes, false),
+                read_capped(stderr, max_output_bytes, true),
+                child.wait(),
+            );
+            Ok::<_, std::io::Error>((stdout?, stderr?, status?))
         },
     )
     .await;
 
     match result {
-        Ok(Ok(output)) => CommandResult {
-            stdout: String::from_utf8_lossy(&output.stdout).to_string(),
-            stderr: String::from_utf8_lossy(&output.stderr).to_string(),
-            return_code: output.status.code().unwrap_or(-1),
+        Ok(Ok((stdout, stderr, status))) => CommandResult {
+            stdout: String::from_utf8_lossy(&stdout).into_owned(),
+            stderr: String::from_utf8_lossy(&stderr).into_owned(),
+            return_code: status.code().unwrap_or(-1),
         },
         Ok(Err(e)) => CommandResult {
             stdout: String::new(),
@@ -62,14 +101,127 @@ pub async fn run_command(
     }
 }
 
+/// Read a child pipe to EOF, keeping only the first `cap` bytes, or the last
+/// `cap` bytes with `keep_tail`.
+async fn read_capped<R: AsyncRead + Unpin>(
+    reader: Option<R>,
+    cap: usize,
+    keep_tail: bool,
+) -> std::io::Result<Vec<u8>> {
+    let mut kept = Vec::new();
+    let Some(mut reader) = reader else {
+        return Ok(kept);
+    };
+
+    let mut chunk = [0u8; 8192];
+    loop {
+        let n = reader.read(&mut chunk).await?;
+        if n == 0 {
+            break;
+        }
+        if keep_tail {
+            kept.extend_from_slice(&chunk[..n]);
+            // Trim in batches rather than shifting the buffer on every chunk
+            if kept.len() > cap.saturating_mul(2).max(chunk.len()) {
+                kept.drain(..kept.len() - cap);
+            }
+        } else {
+            let room = cap.saturating_sub(kept.len());
+            kept.extend_from_slice(&chunk[..n.min(room)]);
+        }
+    }
+
+    if kept.len() > cap {
+        kept.drain(..kept.len() - cap);
+    }
+    Ok(kept)
+}
+
 /// Run a shell command with the default 30s timeout.
 pub async fn run(command: &str, cwd: Option<&str>) -> CommandResult {
     run_command(command, cwd, 30.0).await
 }
 
+/// Run a program with the default 30s timeout.
+pub async fn exec(program: &str, args: &[&str], cwd: Option<&str>) -> CommandResult {
+    exec_command_capped(program, args, cwd, 30.0, DEFAULT_MAX_OUTPUT_BYTES).await
+}
+
+/// Run a shell command for its exit status only.
+/// Output goes to /dev/null instead of through pipes that nobody reads.
+pub async fn run_status(command: &str, cwd: Option<&str>, timeout_secs: f64) -> bool {
+    let mut cmd = Command::new("sh");
+    cmd.arg("-c").arg(command);
+    status_only(cmd, cwd, timeout_secs).await
+}
+
+/// Run a program for its exit status only (30s timeout); see `run_status`.
+pub async fn exec_status(program: &str, args: &[&str], cwd: Option<&str>) -> bool {
+    let mut cmd = Command::new(program);
+    cmd.args(args);
+    status_only(cmd, cwd, 30.0).await
+}
+
+async fn status_only(mut cmd: Command, cwd: Option<&str>, timeout_secs: f64) -> bool {
+    if let Some(dir) = cwd {
+        cmd.current_dir(dir);
+    }
+
+    cmd.stdout(std::process::Stdio::null());
+    cmd.stderr(std::process::Stdio::null());
+
+    let result = tokio::time::timeout(Duration::from_secs_f64(timeout_secs), async {
+        cmd.spawn()?.wait().await
+    })
+    .await;
+
+    matches!(result, Ok(Ok(status)) if status.success())
+}
+
+/// Quote an argument for safe interpolation into an `sh -c` command line.
+pub fn quote(arg: &str) -> String {
+    format!("'{}'", arg.replace('\'', "'\\''"))
+}
+
 /// Check if a command exists in PATH.
+///
+/// Scans PATH in-process (like `which`, without spawning it) and memoizes the
+/// answer: PATH does not change for the lifetime of the process, and tmux/ttyd
+/// are checked on every session and startup call.
 pub async fn command_exists(name: &str) -> bool {
-    run(&format!("which {name}"), None).await.success()
+    static CACHE: OnceLock<Mutex<HashMap<String, bool>>> = OnceLock::new();
+    let cache = CACHE.get_or_init(Default::default);
+
+    if let Some(&found) = cache.lock().unwrap().get(name) {
+        return found;
+    }
+
+    let found = find_in_path(name);
+    cache.lock().unwrap().insert(name.to_string(), found);
+    found
+}
+
+fn find_in_path(name: &str) -> bool {
+    if name.contains('/') {
+        return is_executable(Path::new(name));
+    }
+    std::env::var_os("PATH")
+        .map(|paths| std::env::split_paths(&paths).any(|dir| is_executable(&dir.join(name))))
+        .unwrap_or(false)
+}
+
+#[cfg(unix)]
+fn is_executable(path: &Path) -> bool {
+    use std::os::unix::fs::PermissionsExt;
+
+    std::fs::metadata(path)
+        .map(|m| m.is_file() && m.permissions().mode() & 0o111 != 0)
+        .unwrap_or(false)
+}
+
+#[cfg(not(unix))]
+fn is_executable(path: &Path) -> bool {
+    path.is_file()
 }
 
 #[cfg(test)]
@@ -89,6 +241,29 @@ mod tests {
         assert!(!result.success());
     }
 
+    #[tokio::test]
+    async fn test_exec_passes_args_verbatim() {
+        let result = exec("printf", &["%s", "$HOME; echo injected"], None).await;
+        assert!(result.success());
+        assert_eq!(result.stdout, "$HOME; echo injected");
+    }
+
+    #[tokio::test]
+    async fn test_exec_missing_program() {
+        let result = exec("nonexistent_xyz_12345", &[], None).await;
+        assert_eq!(result.return_code, -1);
+        assert!(result.stderr.contains("Failed to execute command"));
+    }
+
+    #[tokio::test]
+    async fn test_status_only_runners() {
+        assert!(run_status("echo discarded && true", None, 30.0).await);
+        assert!(!run_status("false", None, 30.0).await);
+        assert!(!run_status("sleep 10", None, 0.1).await);
+        assert!(exec_status("true", &[], None).await);
+        assert!(!exec_status("nonexistent_xyz_12345", &[], None).await);
+    }
+
     #[tokio::test]
     async fn test_timeout() {
         let result = run_command("sleep 10", None, 0.1).await;
@@ -96,6 +271,32 @@ mod tests {
         assert!(result.stderr.contains("timed out"));
     }
 
+    #[tokio::test]
+    async fn test_output_is_capped_but_drained() {
+        // 1 MiB on stdout would block the child if the pipe were not drained
+        let script = "head -c 1048576 /dev/zero; echo done >&2";
+        let result = exec_command_capped("sh", &["-c", script], None, 10.0, 16).await;
+        assert!(result.success());
+        assert_eq!(result.stdout.len(), 16);
+        assert_eq!(result.stderr.trim(), "done");
+    }
+
+    #[tokio::test]
+    async fn test_capped_stderr_keeps_the_end() {
+        let script = "echo first; seq 100000 >&2; echo 'fatal: the error' >&2";
+        let result = exec_command_capped("sh", &["-c", script], None, 10.0, 17).await;
+        assert_eq!(result.stdout, "first\n");
+        assert_eq!(result.stderr, "fatal: the error\n");
+    }
+
+    #[tokio::test]
+    async fn test_quote_round_trips_through_sh() {
+        let arg = "it's a \"path\" with $HOME and spaces";
+        let result = run(&format!("printf %s {}", quote(arg)), None).await;
+        assert!(result.success());
+        assert_eq!(result.stdout, arg);
+    }
+
     #[tokio::test]
     async fn test_command_exists_git() {
         assert!(command_exists("git").await);
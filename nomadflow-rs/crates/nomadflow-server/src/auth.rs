@@ -17,33 +17,32 @@ pub async fn auth_middleware(
     request: Request<axum::body::Body>,
     next: Next,
 ) -> Response {
-    let secret = &state.settings.auth.secret;
+    let secret = state.settings.auth.secret.as_bytes();
 
     // Skip auth if no secret configured
     if secret.is_empty() {
         return next.run(request).await;
     }
 
-    // Check Authorization header
+    // Check Authorization header (static HeaderName: no per-request name parsing)
     let auth_header = request
         .headers()
-        .get("Authorization")
-        .and_then(|v| v.to_str().ok());
+        .get(header::AUTHORIZATION)
+        .map(|v| v.as_bytes());
 
     let authenticated = match auth_header {
-        Some(h) if h.starts_with("Bearer ") => {
-            h.as_bytes()[7..].ct_eq(secret.as_bytes()).into()
-        }
-        Some(h) if h.starts_with("Basic ") => {
-            // Decode Basic Auth and check password matches secret
+        Some(h) if h.starts_with(b"Bearer ") => h[7..].ct_eq(secret).into(),
+        Some(h) if h.starts_with(b"Basic ") => {
+            // Decode Basic Auth and check password matches secret.
+            // Compare raw bytes after the first ':' — no UTF-8 validation or String needed.
             base64::engine::general_purpose::STANDARD
                 .decode(&h[6..])
                 .ok()
-                .and_then(|bytes| String::from_utf8(bytes).ok())
                 .and_then(|decoded| {
                     decoded
-                        .split_once(':')
-                        .map(|(_, pw)| pw.as_bytes().ct_eq(secret.as_bytes()).into())
+                        .iter()
+                        .position(|&b| b == b':')
+                        .map(|pos| decoded[pos + 1..].ct_eq(secret).into())
                 })
                 .unwrap_or(false)
         }
@@ -1,3 +1,5 @@
+use std::fmt::Write;
+
 use qrcode::QrCode;
 
 /// Render a QR code as a compact Unicode string using half-block characters.
@@ -109,31 +111,36 @@ pub fn print_connection_info(connect_url: &str, secret: &str, public: bool) {
         format!("  ║{}{}║", s, " ".repeat(box_width - len))
     };
 
-    eprintln!();
-    eprintln!("{top}");
-    eprintln!("{}", center("NomadFlow Server Ready"));
-    eprintln!("{sep}");
-    eprintln!("{empty}");
+    let mut out = String::new();
+    let _ = writeln!(out);
+    let _ = writeln!(out, "{top}");
+    let _ = writeln!(out, "{}", center("NomadFlow Server Ready"));
+    let _ = writeln!(out, "{sep}");
+    let _ = writeln!(out, "{empty}");
 
     for line in &qr_lines {
-        eprintln!("{}", center(line));
+        let _ = writeln!(out, "{}", center(line));
     }
 
-    eprintln!("{empty}");
-    eprintln!("{}", center("Scan this QR code from the app"));
-    eprintln!("{}", center("or enter manually:"));
-    eprintln!("{empty}");
-    eprintln!("{}", left_align(&url_line));
+    let _ = writeln!(out, "{empty}");
+    let _ = writeln!(out, "{}", center("Scan this QR code from the app"));
+    let _ = writeln!(out, "{}", center("or enter manually:"));
+    let _ = writeln!(out, "{empty}");
+    let _ = writeln!(out, "{}", left_align(&url_line));
     if !secret.is_empty() {
-        eprintln!("{}", left_align(&secret_line));
+        let _ = writeln!(out, "{}", left_align(&secret_line));
     }
-    eprintln!("{empty}");
-    eprintln!("{bottom}");
+    let _ = writeln!(out, "{empty}");
+    let _ = writeln!(out, "{bottom}");
     if public {
-        eprintln!();
-        eprintln!("  Public tunnel provided by fab_uleuh — free during beta.");
-        eprintln!("  This may become a paid option in the future.");
-        eprintln!("  You can always self-host via VPN or your own relay.");
+        let _ = writeln!(out);
+        let _ = writeln!(out, "  Public tunnel provided by fab_uleuh — free during beta.");
+        let _ = writeln!(out, "  This may become a paid option in the future.");
+        let _ = writeln!(out, "  You can always self-host via VPN or your own relay.");
     }
-    eprintln!();
+    let _ = writeln!(out);
+
+    // stderr is unbuffered: emit the whole banner in one write instead of
+    // taking the stderr lock and issuing a syscall for every line.
+    eprint!("{out}");
 }
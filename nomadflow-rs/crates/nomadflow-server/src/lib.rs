@@ -14,7 +14,6 @@ use tower_http::trace::TraceLayer;
 use tracing::info;
 
 use nomadflow_core::config::Settings;
-use nomadflow_core::services::tmux::TmuxService;
 use nomadflow_core::services::ttyd::TtydService;
 
 use crate::auth::auth_middleware;
@@ -125,36 +124,37 @@ pub async fn serve(
         settings.auth.secret = secret;
     }
 
-    // 1. Ensure tmux session exists (ttyd needs it)
-    let tmux = TmuxService::new(&settings.tmux.session);
-    if let Err(e) = tmux.ensure_session().await {
+    // 1. Build shared state; its services are reused for startup and every request
+    let state = Arc::new(AppState::new(settings.clone()));
+
+    // 2. Ensure tmux session exists (ttyd needs it)
+    if let Err(e) = state.tmux.ensure_session().await {
         tracing::warn!("Failed to ensure tmux session: {e}");
     } else {
         info!(session = %settings.tmux.session, "Tmux session ready");
     }
 
-    // 2. Start ttyd subprocess
+    // 3. Start ttyd subprocess
     let mut ttyd = TtydService::new(&settings);
     match ttyd.start().await {
         Ok(()) => info!(port = settings.ttyd.port, "ttyd started"),
         Err(e) => tracing::warn!("Failed to start ttyd: {e} (terminal proxy will not work)"),
     }
 
-    // 3. Build state and router
-    let state = Arc::new(AppState::new(settings.clone()));
+    // 4. Build router
     let addr = format!("{}:{}", settings.api.host, settings.api.port);
     let router = build_router(state.clone());
 
     let listener = TcpListener::bind(&addr).await?;
     info!(%addr, "NomadFlow server listening");
 
-    // 4. Start tunnel if --public
+    // 5. Start tunnel if --public
     let connect_url = if public {
         match tunnel::start_tunnel(
             settings.api.port,
             &settings.tunnel,
             shutdown.clone(),
-            &state.http_client,
+            state.http_client(),
         )
         .await
         {
@@ -168,7 +168,7 @@ pub async fn serve(
         build_connect_url(&host_override, settings.api.port)
     };
 
-    // 5. Display connection info with QR code (only in foreground serve mode)
+    // 6. Display connection info with QR code (only in foreground serve mode)
     if !quiet {
         display::print_connection_info(&connect_url, &settings.auth.secret, public);
     }
@@ -1,39 +1,74 @@
 use std::sync::Arc;
 
 use axum::{
+    body::{Body, Bytes},
     extract::State,
-    http::StatusCode,
+    http::{header, StatusCode},
+    response::{IntoResponse, Response},
     routing::post,
     Json, Router,
 };
-use serde_json::{json, Value};
+use futures_util::stream;
+use tokio::sync::mpsc;
 
 use nomadflow_core::models::{
     AttachBranchRequest, AttachBranchResponse, CreateFeatureRequest, CreateFeatureResponse,
-    DeleteFeatureRequest, DeleteFeatureResponse, ListBranchesRequest, ListBranchesResponse,
-    ListFeaturesRequest, ListFeaturesResponse, SwitchFeatureRequest, SwitchFeatureResponse,
+    DeleteFeatureRequest, DeleteFeatureResponse, ErrorResponse, ListBranchesRequest,
+    ListBranchesResponse, ListFeaturesRequest, ListFeaturesResponse, SwitchFeatureRequest,
+    SwitchFeatureResponse,
 };
-use nomadflow_core::services::tmux::window_name;
+use nomadflow_core::services::tmux::{last_path_segment, window_name};
 
 use crate::state::AppState;
 
 async fn list_features(
     State(state): State<Arc<AppState>>,
     Json(request): Json<ListFeaturesRequest>,
-) -> Result<Json<ListFeaturesResponse>, (StatusCode, Json<Value>)> {
+) -> Result<Json<ListFeaturesResponse>, (StatusCode, Json<ErrorResponse>)> {
     match state.git.list_features(&request.repo_path).await {
         Ok(features) => Ok(Json(ListFeaturesResponse { features })),
         Err(e) => Err((
             StatusCode::INTERNAL_SERVER_ERROR,
-            Json(json!({ "detail": e.to_string() })),
+            Json(ErrorResponse { detail: e.to_string() }),
         )),
     }
 }
 
+/// Same listing as `/api/list-features`, but written as NDJSON: one feature
+/// object per line, each sent as soon as git has reported that worktree, so
+/// clients can start rendering before the scan is over.
+async fn list_features_stream(
+    State(state): State<Arc<AppState>>,
+    Json(request): Json<ListFeaturesRequest>,
+) -> Response {
+    let (tx, rx) = mpsc::channel(16);
+    tokio::spawn(async move {
+        // The status line is already sent: a failure can only end the body early
+        if let Err(e) = state.git.stream_features(&request.repo_path, tx).await {
+            tracing::warn!("Failed to stream features of {}: {e}", request.repo_path);
+        }
+    });
+
+    let lines = stream::unfold(rx, |mut rx| async move {
+        let feature = rx.recv().await?;
+        let line = serde_json::to_vec(&feature).map(|mut line| {
+            line.push(b'\n');
+            Bytes::from(line)
+        });
+        Some((line, rx))
+    });
+
+    (
+        [(header::CONTENT_TYPE, "application/x-ndjson")],
+        Body::from_stream(lines),
+    )
+        .into_response()
+}
+
 async fn create_feature(
     State(state): State<Arc<AppState>>,
     Json(request): Json<CreateFeatureRequest>,
-) -> Result<Json<CreateFeatureResponse>, (StatusCode, Json<Value>)> {
+) -> Result<Json<CreateFeatureResponse>, (StatusCode, Json<ErrorResponse>)> {
     let base_branch = if request.base_branch == "main" {
         None
     } else {
@@ -47,26 +82,22 @@ async fn create_feature(
         .map_err(|e| {
             (
                 StatusCode::BAD_REQUEST,
-                Json(json!({ "detail": e.to_string() })),
+                Json(ErrorResponse { detail: e.to_string() }),
             )
         })?;
 
     // Derive the worktree name for tmux window naming
-    let wt_name = std::path::Path::new(&worktree_path)
-        .file_name()
-        .unwrap_or_default()
-        .to_string_lossy()
-        .to_string();
+    let wt_name = last_path_segment(&worktree_path);
 
     // Ensure tmux session and window
     state.tmux.ensure_session().await.map_err(|e| {
         (
             StatusCode::INTERNAL_SERVER_ERROR,
-            Json(json!({ "detail": e.to_string() })),
+            Json(ErrorResponse { detail: e.to_string() }),
         )
     })?;
 
-    let win_name = window_name(&request.repo_path, &wt_name);
+    let win_name = window_name(&request.repo_path, wt_name);
     state
         .tmux
         .ensure_window(&win_name, Some(&worktree_path))
@@ -74,7 +105,7 @@ async fn create_feature(
         .map_err(|e| {
             (
                 StatusCode::INTERNAL_SERVER_ERROR,
-                Json(json!({ "detail": e.to_string() })),
+                Json(ErrorResponse { detail: e.to_string() }),
             )
         })?;
 
@@ -88,24 +119,26 @@ async fn create_feature(
 async fn delete_feature(
     State(state): State<Arc<AppState>>,
     Json(request): Json<DeleteFeatureRequest>,
-) -> Result<Json<DeleteFeatureResponse>, (StatusCode, Json<Value>)> {
+) -> Result<Json<DeleteFeatureResponse>, (StatusCode, Json<ErrorResponse>)> {
     // Prevent deletion of main branch
-    let features = state
+    let feature = state
         .git
-        .list_features(&request.repo_path)
+        .get_feature(&request.repo_path, &request.feature_name)
         .await
         .map_err(|e| {
             (
                 StatusCode::INTERNAL_SERVER_ERROR,
-                Json(json!({ "detail": e.to_string() })),
+                Json(ErrorResponse { detail: e.to_string() }),
             )
         })?;
 
-    if let Some(f) = features.iter().find(|f| f.name == request.feature_name) {
+    if let Some(f) = feature {
         if f.is_main {
             return Err((
                 StatusCode::BAD_REQUEST,
-                Json(json!({ "detail": "Cannot delete the main repository branch" })),
+                Json(ErrorResponse {
+                    detail: "Cannot delete the main repository branch".to_string(),
+                }),
             ));
         }
     }
@@ -121,7 +154,7 @@ async fn delete_feature(
         .map_err(|e| {
             (
                 StatusCode::INTERNAL_SERVER_ERROR,
-                Json(json!({ "detail": e.to_string() })),
+                Json(ErrorResponse { detail: e.to_string() }),
             )
         })?;
 
@@ -131,22 +164,20 @@ async fn delete_feature(
 async fn switch_feature(
     State(state): State<Arc<AppState>>,
     Json(request): Json<SwitchFeatureRequest>,
-) -> Result<Json<SwitchFeatureResponse>, (StatusCode, Json<Value>)> {
-    let features = state
+) -> Result<Json<SwitchFeatureResponse>, (StatusCode, Json<ErrorResponse>)> {
+    let feature = state
         .git
-        .list_features(&request.repo_path)
+        .get_feature(&request.repo_path, &request.feature_name)
         .await
         .map_err(|e| {
             (
                 StatusCode::INTERNAL_SERVER_ERROR,
-                Json(json!({ "detail": e.to_string() })),
+                Json(ErrorResponse { detail: e.to_string() }),
             )
         })?;
 
-    let feature = features.iter().find(|f| f.name == request.feature_name);
-
     let worktree_path = if let Some(f) = feature {
-        f.worktree_path.clone()
+        f.worktree_path
     } else {
         // Feature doesn't exist, create it
         let (wt, _branch) = state
@@ -156,7 +187,7 @@ async fn switch_feature(
             .map_err(|e| {
                 (
                     StatusCode::BAD_REQUEST,
-                    Json(json!({ "detail": e.to_string() })),
+                    Json(ErrorResponse { detail: e.to_string() }),
                 )
             })?;
         wt
@@ -166,7 +197,7 @@ async fn switch_feature(
     state.tmux.ensure_session().await.map_err(|e| {
         (
             StatusCode::INTERNAL_SERVER_ERROR,
-            Json(json!({ "detail": e.to_string() })),
+            Json(ErrorResponse { detail: e.to_string() }),
         )
     })?;
 
@@ -179,14 +210,16 @@ async fn switch_feature(
         .map_err(|e| {
             (
                 StatusCode::INTERNAL_SERVER_ERROR,
-                Json(json!({ "detail": e.to_string() })),
+                Json(ErrorResponse { detail: e.to_string() }),
             )
         })?;
 
     if !switched {
         return Err((
             StatusCode::INTERNAL_SERVER_ERROR,
-            Json(json!({ "detail": format!("Failed to switch to window '{win_name}'") })),
+            Json(ErrorResponse {
+                detail: format!("Failed to switch to window '{win_name}'"),
+            }),
         ));
     }
 
@@ -201,7 +234,7 @@ async fn switch_feature(
 async fn list_branches(
     State(state): State<Arc<AppState>>,
     Json(request): Json<ListBranchesRequest>,
-) -> Result<Json<ListBranchesResponse>, (StatusCode, Json<Value>)> {
+) -> Result<Json<ListBranchesResponse>, (StatusCode, Json<ErrorResponse>)> {
     let (branches, default_branch) = state
         .git
         .list_branches(&request.repo_path)
@@ -209,7 +242,7 @@ async fn list_branches(
         .map_err(|e| {
             (
                 StatusCode::INTERNAL_SERVER_ERROR,
-                Json(json!({ "detail": e.to_string() })),
+                Json(ErrorResponse { detail: e.to_string() }),
             )
         })?;
 
@@ -222,7 +255,7 @@ async fn list_branches(
 async fn attach_branch(
     State(state): State<Arc<AppState>>,
     Json(request): Json<AttachBranchRequest>,
-) -> Result<Json<AttachBranchResponse>, (StatusCode, Json<Value>)> {
+) -> Result<Json<AttachBranchResponse>, (StatusCode, Json<ErrorResponse>)> {
     let (worktree_path, branch) = state
         .git
         .attach_branch(&request.repo_path, &request.branch_name)
@@ -230,25 +263,21 @@ async fn attach_branch(
         .map_err(|e| {
             (
                 StatusCode::BAD_REQUEST,
-                Json(json!({ "detail": e.to_string() })),
+                Json(ErrorResponse { detail: e.to_string() }),
             )
         })?;
 
-    let wt_name = std::path::Path::new(&worktree_path)
-        .file_name()
-        .unwrap_or_default()
-        .to_string_lossy()
-        .to_string();
+    let wt_name = last_path_segment(&worktree_path);
 
     // Ensure tmux session and window
     state.tmux.ensure_session().await.map_err(|e| {
         (
             StatusCode::INTERNAL_SERVER_ERROR,
-            Json(json!({ "detail": e.to_string() })),
+            Json(ErrorResponse { detail: e.to_string() }),
         )
     })?;
 
-    let win_name = window_name(&request.repo_path, &wt_name);
+    let win_name = window_name(&request.repo_path, wt_name);
     state
         .tmux
         .ensure_window(&win_name, Some(&worktree_path))
@@ -256,7 +285,7 @@ async fn attach_branch(
         .map_err(|e| {
             (
                 StatusCode::INTERNAL_SERVER_ERROR,
-                Json(json!({ "detail": e.to_string() })),
+                Json(ErrorResponse { detail: e.to_string() }),
             )
         })?;
 
@@ -270,9 +299,69 @@ async fn attach_branch(
 pub fn router() -> Router<Arc<AppState>> {
     Router::new()
         .route("/api/list-features", post(list_features))
+        .route("/api/list-features-stream", post(list_features_stream))
         .route("/api/create-feature", post(create_feature))
         .route("/api/delete-feature", post(delete_feature))
         .route("/api/switch-feature", post(switch_feature))
         .route("/api/list-branches", post(list_branches))
         .route("/api/attach-branch", post(attach_branch))
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use axum::http::Request;
+    use http_body_util::BodyExt;
+    use nomadflow_core::config::{PathsConfig, Settings};
+    use nomadflow_core::shell::run;
+    use tempfile::TempDir;
+    use tower::ServiceExt;
+
+    #[tokio::test]
+    async fn test_list_features_stream_is_ndjson() {
+        let tmp = TempDir::new().unwrap();
+        let settings = Settings {
+            paths: PathsConfig {
+                base_dir: tmp.path().to_string_lossy().to_string(),
+            },
+            ..Default::default()
+        };
+        settings.ensure_directories().unwrap();
+
+        let repo_dir = settings.repos_dir().join("test-repo");
+        std::fs::create_dir_all(&repo_dir).unwrap();
+        run("git init", Some(&repo_dir.to_string_lossy())).await;
+        run(
+            "git commit --allow-empty -m init",
+            Some(&repo_dir.to_string_lossy()),
+        )
+        .await;
+        std::fs::create_dir_all(settings.worktrees_dir().join("test-repo/feature-a")).unwrap();
+
+        let app = router().with_state(Arc::new(AppState::new(settings)));
+        let request = Request::post("/api/list-features-stream")
+            .header(header::CONTENT_TYPE, "application/json")
+            .body(Body::from(
+                serde_json::json!({ "repoPath": repo_dir.to_string_lossy() }).to_string(),
+            ))
+            .unwrap();
+        let response = app.oneshot(request).await.unwrap();
+
+        assert_eq!(response.status(), StatusCode::OK);
+        assert_eq!(response.headers()[header::CONTENT_TYPE], "application/x-ndjson");
+
+        let body = response.into_body().collect().await.unwrap().to_bytes();
+        let body = std::str::from_utf8(&body).unwrap();
+        assert!(body.ends_with('\n'));
+
+        // One JSON object per line: the main worktree, then the directory
+        let features: Vec<serde_json::Value> = body
+            .lines()
+            .map(|line| serde_json::from_str(line).unwrap())
+            .collect();
+        assert_eq!(features.len(), 2);
+        assert!(features.iter().all(|f| f.is_object()));
+        assert_eq!(features[0]["isMain"], true);
+        assert_eq!(features[1]["name"], "feature-a");
+    }
+}
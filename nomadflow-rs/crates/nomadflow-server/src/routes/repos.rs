@@ -6,21 +6,22 @@ use axum::{
     routing::post,
     Json, Router,
 };
-use serde_json::{json, Value};
 
 use nomadflow_core::error::NomadError;
-use nomadflow_core::models::{CloneRepoRequest, CloneRepoResponse, ListReposResponse};
+use nomadflow_core::models::{
+    CloneRepoRequest, CloneRepoResponse, ErrorResponse, ListReposResponse,
+};
 
 use crate::state::AppState;
 
 async fn list_repos(
     State(state): State<Arc<AppState>>,
-) -> Result<Json<ListReposResponse>, (StatusCode, Json<Value>)> {
+) -> Result<Json<ListReposResponse>, (StatusCode, Json<ErrorResponse>)> {
     match state.git.list_repos().await {
         Ok(repos) => Ok(Json(ListReposResponse { repos })),
         Err(e) => Err((
             StatusCode::INTERNAL_SERVER_ERROR,
-            Json(json!({ "detail": e.to_string() })),
+            Json(ErrorResponse { detail: e.to_string() }),
         )),
     }
 }
@@ -28,7 +29,7 @@ async fn list_repos(
 async fn clone_repo(
     State(state): State<Arc<AppState>>,
     Json(request): Json<CloneRepoRequest>,
-) -> Result<Json<CloneRepoResponse>, (StatusCode, Json<Value>)> {
+) -> Result<Json<CloneRepoResponse>, (StatusCode, Json<ErrorResponse>)> {
     match state
         .git
         .clone_repo(&request.url, request.token.as_deref(), request.name.as_deref())
@@ -37,11 +38,11 @@ async fn clone_repo(
         Ok((name, path, branch)) => Ok(Json(CloneRepoResponse { name, path, branch })),
         Err(NomadError::AlreadyExists(msg)) => Err((
             StatusCode::CONFLICT,
-            Json(json!({ "detail": msg })),
+            Json(ErrorResponse { detail: msg }),
         )),
         Err(e) => Err((
             StatusCode::INTERNAL_SERVER_ERROR,
-            Json(json!({ "detail": e.to_string() })),
+            Json(ErrorResponse { detail: e.to_string() }),
         )),
     }
 }
@@ -6,12 +6,11 @@ use axum::{
         ws::WebSocket,
         Path, Query, State, WebSocketUpgrade,
     },
-    http::{header, StatusCode},
+    http::{header, HeaderValue, StatusCode},
     response::{IntoResponse, Response},
     routing::get,
     Router,
 };
-use base64::Engine;
 use serde::Deserialize;
 use subtle::ConstantTimeEq;
 use tokio_tungstenite::tungstenite::client::IntoClientRequest;
@@ -36,7 +35,7 @@ async fn ws_proxy(
 ) -> Response {
     let secret = &state.settings.auth.secret;
     if !secret.is_empty() {
-        let token = query.token.unwrap_or_default();
+        let token = query.token.as_deref().unwrap_or_default();
         let matches: bool = token.as_bytes().ct_eq(secret.as_bytes()).into();
         if !matches {
             warn!("WebSocket auth failed: invalid token");
@@ -47,16 +46,14 @@ async fn ws_proxy(
         }
     }
 
-    let ttyd_port = state.settings.ttyd.port;
-    let auth_secret = state.settings.auth.secret.clone();
+    let ws_url = state.ttyd_ws_url.clone();
+    let auth_header = state.ttyd_auth_header.clone();
 
     ws.protocols(["tty"])
-        .on_upgrade(move |socket| handle_ws(socket, ttyd_port, auth_secret))
+        .on_upgrade(move |socket| handle_ws(socket, ws_url, auth_header))
 }
 
-async fn handle_ws(client_ws: WebSocket, ttyd_port: u16, auth_secret: String) {
-    let ws_url = format!("ws://127.0.0.1:{ttyd_port}/ws");
-
+async fn handle_ws(client_ws: WebSocket, ws_url: String, auth_header: Option<HeaderValue>) {
     let mut request = match ws_url.into_client_request() {
         Ok(r) => r,
         Err(e) => {
@@ -65,16 +62,13 @@ async fn handle_ws(client_ws: WebSocket, ttyd_port: u16, auth_secret: String) {
         }
     };
 
+    // Fixed subprotocol: use static header name/value instead of parsing them per connection
     request
         .headers_mut()
-        .insert("Sec-WebSocket-Protocol", "tty".parse().unwrap());
-
-    if !auth_secret.is_empty() {
-        let creds = base64::engine::general_purpose::STANDARD
-            .encode(format!("nomadflow:{auth_secret}"));
-        request
-            .headers_mut()
-            .insert("Authorization", format!("Basic {creds}").parse().unwrap());
+        .insert(header::SEC_WEBSOCKET_PROTOCOL, HeaderValue::from_static("tty"));
+
+    if let Some(value) = auth_header {
+        request.headers_mut().insert(header::AUTHORIZATION, value);
     }
 
     let ttyd_ws = match connect_async(request).await {
@@ -108,14 +102,13 @@ async fn proxy_ttyd_request(
     state: &AppState,
     path: &str,
 ) -> Result<impl IntoResponse, StatusCode> {
-    let ttyd_port = state.settings.ttyd.port;
-    let url = format!("http://127.0.0.1:{ttyd_port}{path}");
+    let url = format!("{}{path}", state.ttyd_http_url);
 
-    let mut req = state.http_client.get(&url);
+    let mut req = state.http_client().get(&url);
 
     // Add Basic Auth if secret is configured
-    if !state.settings.auth.secret.is_empty() {
-        req = req.basic_auth("nomadflow", Some(&state.settings.auth.secret));
+    if let Some(value) = &state.ttyd_auth_header {
+        req = req.header(header::AUTHORIZATION, value.clone());
     }
 
     let resp = req.send().await.map_err(|e| {
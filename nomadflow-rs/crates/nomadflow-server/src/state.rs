@@ -1,3 +1,8 @@
+use std::sync::OnceLock;
+
+use axum::http::HeaderValue;
+use base64::Engine;
+
 use nomadflow_core::config::Settings;
 use nomadflow_core::services::git::GitService;
 use nomadflow_core::services::tmux::TmuxService;
@@ -6,18 +11,47 @@ pub struct AppState {
     pub settings: Settings,
     pub git: GitService,
     pub tmux: TmuxService,
-    pub http_client: reqwest::Client,
+    /// `Authorization: Basic …` header for ttyd, encoded once (None if no secret).
+    pub ttyd_auth_header: Option<HeaderValue>,
+    /// ttyd WebSocket endpoint (`ws://127.0.0.1:<port>/ws`).
+    pub ttyd_ws_url: String,
+    /// ttyd HTTP origin (`http://127.0.0.1:<port>`), request paths are appended to it.
+    pub ttyd_http_url: String,
+    http_client: OnceLock<reqwest::Client>,
 }
 
 impl AppState {
     pub fn new(settings: Settings) -> Self {
         let git = GitService::new(&settings);
         let tmux = TmuxService::new(&settings.tmux.session);
+        let ttyd_auth_header = ttyd_auth_header(&settings.auth.secret);
+        let ttyd_port = settings.ttyd.port;
         Self {
             settings,
             git,
             tmux,
-            http_client: reqwest::Client::new(),
+            ttyd_auth_header,
+            ttyd_ws_url: format!("ws://127.0.0.1:{ttyd_port}/ws"),
+            ttyd_http_url: format!("http://127.0.0.1:{ttyd_port}"),
+            http_client: OnceLock::new(),
         }
     }
+
+    /// Shared HTTP client, built on first use.
+    /// Building it loads the TLS root store, which only the terminal proxy
+    /// and the tunnel need — not every caller that constructs the state.
+    pub fn http_client(&self) -> &reqwest::Client {
+        self.http_client.get_or_init(reqwest::Client::new)
+    }
+}
+
+/// Build the Basic Auth header ttyd expects (`nomadflow:<secret>`).
+fn ttyd_auth_header(secret: &str) -> Option<HeaderValue> {
+    if secret.is_empty() {
+        return None;
+    }
+    let creds = base64::engine::general_purpose::STANDARD.encode(format!("nomadflow:{secret}"));
+    let mut value = HeaderValue::from_str(&format!("Basic {creds}")).ok()?;
+    value.set_sensitive(true);
+    Some(value)
 }
@@ -1,9 +1,19 @@
+use std::sync::OnceLock;
+
 use nomadflow_core::models::{
-    Feature, ListFeaturesResponse, ListReposResponse, Repository,
+    CreateFeatureRequest, Feature, ListFeaturesRequest, ListFeaturesResponse, ListReposResponse,
+    Repository, SwitchFeatureRequest,
 };
 
 use crate::state::ServerConfig;
 
+/// Process-wide HTTP client, so every call reuses the same connection pool
+/// and TLS setup instead of rebuilding them per request.
+fn client() -> &'static reqwest::Client {
+    static CLIENT: OnceLock<reqwest::Client> = OnceLock::new();
+    CLIENT.get_or_init(reqwest::Client::new)
+}
+
 /// Derive the API base URL from a server config.
 pub fn get_api_base_url(server: &ServerConfig) -> String {
     let url = server
@@ -23,8 +33,7 @@ pub async fn check_health(server: &ServerConfig) -> bool {
     let base = get_api_base_url(server).replace("/api", "");
     let url = format!("{base}/health");
 
-    let client = reqwest::Client::new();
-    let mut req = client.get(&url).timeout(std::time::Duration::from_secs(3));
+    let mut req = client().get(&url).timeout(std::time::Duration::from_secs(3));
     if let Some(ref token) = server.auth_token {
         req = req.header("Authorization", format!("Bearer {token}"));
     }
@@ -36,8 +45,7 @@ pub async fn check_health(server: &ServerConfig) -> bool {
 pub async fn list_repos(server: &ServerConfig) -> Result<Vec<Repository>, String> {
     let url = format!("{}/list-repos", get_api_base_url(server));
 
-    let client = reqwest::Client::new();
-    let mut req = client
+    let mut req = client()
         .post(&url)
         .header("Content-Type", "application/json")
         .timeout(std::time::Duration::from_secs(10));
@@ -63,11 +71,12 @@ pub async fn list_features(
 ) -> Result<Vec<Feature>, String> {
     let url = format!("{}/list-features", get_api_base_url(server));
 
-    let client = reqwest::Client::new();
-    let mut req = client
+    let mut req = client()
         .post(&url)
         .header("Content-Type", "application/json")
-        .json(&serde_json::json!({ "repoPath": repo_path }))
+        .json(&ListFeaturesRequest {
+            repo_path: repo_path.to_string(),
+        })
         .timeout(std::time::Duration::from_secs(10));
 
     if let Some(ref token) = server.auth_token {
@@ -92,14 +101,14 @@ pub async fn create_feature(
 ) -> Result<String, String> {
     let url = format!("{}/create-feature", get_api_base_url(server));
 
-    let client = reqwest::Client::new();
-    let mut req = client
+    let mut req = client()
         .post(&url)
         .header("Content-Type", "application/json")
-        .json(&serde_json::json!({
-            "repoPath": repo_path,
-            "featureName": feature_name,
-        }))
+        .json(&CreateFeatureRequest {
+            repo_path: repo_path.to_string(),
+            branch_name: feature_name.to_string(),
+            base_branch: "main".to_string(),
+        })
         .timeout(std::time::Duration::from_secs(30));
 
     if let Some(ref token) = server.auth_token {
@@ -124,14 +133,13 @@ pub async fn switch_feature(
 ) -> Result<String, String> {
     let url = format!("{}/switch-feature", get_api_base_url(server));
 
-    let client = reqwest::Client::new();
-    let mut req = client
+    let mut req = client()
         .post(&url)
         .header("Content-Type", "application/json")
-        .json(&serde_json::json!({
-            "repoPath": repo_path,
-            "featureName": feature_name,
-        }))
+        .json(&SwitchFeatureRequest {
+            repo_path: repo_path.to_string(),
+            feature_name: feature_name.to_string(),
+        })
         .timeout(std::time::Duration::from_secs(10));
 
     if let Some(ref token) = server.auth_token {
@@ -8,12 +8,10 @@ pub struct LocalTmuxWindow {
     pub active: bool,
 }
 
-fn exec(cmd: &str) -> Option<String> {
-    let output = Command::new("sh")
-        .arg("-c")
-        .arg(cmd)
-        .output()
-        .ok()?;
+/// Run tmux directly with an argument vector (no `sh -c`), returning
+/// trimmed stdout on success.
+fn tmux(args: &[&str]) -> Option<String> {
+    let output = Command::new("tmux").args(args).output().ok()?;
 
     if output.status.success() {
         Some(String::from_utf8_lossy(&output.stdout).trim().to_string())
@@ -23,17 +21,21 @@ fn exec(cmd: &str) -> Option<String> {
 }
 
 pub fn is_tmux_installed() -> bool {
-    exec("which tmux").is_some()
+    tmux(&["-V"]).is_some()
 }
 
 pub fn session_exists(session: &str) -> bool {
-    exec(&format!("tmux has-session -t \"{session}\" 2>/dev/null")).is_some()
+    tmux(&["has-session", "-t", session]).is_some()
 }
 
 pub fn list_windows(session: &str) -> Vec<LocalTmuxWindow> {
-    let output = match exec(&format!(
-        "tmux list-windows -t \"{session}\" -F \"#{{window_index}}:#{{window_name}}:#{{window_active}}\""
-    )) {
+    let output = match tmux(&[
+        "list-windows",
+        "-t",
+        session,
+        "-F",
+        "#{window_index}:#{window_name}:#{window_active}",
+    ]) {
         Some(o) => o,
         None => return Vec::new(),
     };
@@ -57,9 +59,8 @@ pub fn list_windows(session: &str) -> Vec<LocalTmuxWindow> {
 }
 
 pub fn get_pane_command(session: &str, window: &str) -> Option<String> {
-    exec(&format!(
-        "tmux list-panes -t \"{session}:{window}\" -F \"#{{pane_current_command}}\""
-    ))
+    let target = format!("{session}:{window}");
+    tmux(&["list-panes", "-t", &target, "-F", "#{pane_current_command}"])
 }
 
 pub fn is_shell_idle(session: &str, window: &str) -> bool {
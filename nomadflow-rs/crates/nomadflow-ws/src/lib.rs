@@ -12,56 +12,32 @@ pub async fn bridge(
     let (mut client_tx, mut client_rx) = client.split();
     let (mut upstream_tx, mut upstream_rx) = upstream.split();
 
+    // ttyd frames are binary; forward them as-is (both sides hold `Bytes`, so no copy)
     let client_to_upstream = async {
         while let Some(msg) = client_rx.next().await {
-            match msg {
-                Ok(Message::Text(text)) => {
-                    if upstream_tx
-                        .send(tungstenite::Message::Text(text.to_string().into()))
-                        .await
-                        .is_err()
-                    {
-                        break;
-                    }
-                }
-                Ok(Message::Binary(data)) => {
-                    if upstream_tx
-                        .send(tungstenite::Message::Binary(data.to_vec().into()))
-                        .await
-                        .is_err()
-                    {
-                        break;
-                    }
-                }
+            let msg = match msg {
+                Ok(Message::Binary(data)) => tungstenite::Message::Binary(data),
+                Ok(Message::Text(text)) => tungstenite::Message::Text(text.to_string().into()),
                 Ok(Message::Close(_)) | Err(_) => break,
-                _ => {}
+                _ => continue,
+            };
+            if upstream_tx.send(msg).await.is_err() {
+                break;
             }
         }
     };
 
+    // Terminal output is the high-volume direction: same zero-copy pass-through
     let upstream_to_client = async {
         while let Some(msg) = upstream_rx.next().await {
-            match msg {
-                Ok(tungstenite::Message::Text(text)) => {
-                    if client_tx
-                        .send(Message::Text(text.to_string().into()))
-                        .await
-                        .is_err()
-                    {
-                        break;
-                    }
-                }
-                Ok(tungstenite::Message::Binary(data)) => {
-                    if client_tx
-                        .send(Message::Binary(data.to_vec().into()))
-                        .await
-                        .is_err()
-                    {
-                        break;
-                    }
-                }
+            let msg = match msg {
+                Ok(tungstenite::Message::Binary(data)) => Message::Binary(data),
+                Ok(tungstenite::Message::Text(text)) => Message::Text(text.to_string().into()),
                 Ok(tungstenite::Message::Close(_)) | Err(_) => break,
-                _ => {}
+                _ => continue,
+            };
+            if client_tx.send(msg).await.is_err() {
+                break;
             }
         }
     };
@@ -71,5 +47,10 @@ pub async fn bridge(
         _ = upstream_to_client => {},
     }
 
+    // Tear both sides down together: whichever direction ended first, send a Close
+    // to the other peer now instead of leaving it to notice the dropped socket.
+    let _ = upstream_tx.close().await;
+    let _ = client_tx.close().await;
+
     info!("WebSocket bridge session ended");
 }